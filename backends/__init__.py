@@ -1,9 +1,16 @@
 from .analysis import AnalysisBackend
 from .base import BaseBackend
-from .registry import BACKEND_REGISTRY, BackendRegistry, BackendType, get_backend, register_backend
+from .registry import (
+    BACKEND_REGISTRY,
+    BackendRegistry,
+    BackendType,
+    get_backend,
+    register_backend,
+    register_backend_lazy,
+)
 from .review import ReviewBackend
 from .scm import SCMBackend
-from .demo import *  # noqa: F401,F403  Import side effects register built-ins
+from . import demo  # noqa: F401  Registers built-in demo backends lazily
 
 __all__ = [
     "AnalysisBackend",
@@ -15,4 +22,5 @@ __all__ = [
     "SCMBackend",
     "get_backend",
     "register_backend",
+    "register_backend_lazy",
 ]
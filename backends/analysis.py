@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from abc import abstractmethod
 from typing import Any
 
 from .base import BaseBackend
@@ -9,10 +8,14 @@ from .base import BaseBackend
 class AnalysisBackend(BaseBackend):
     """Interface for analysis backends."""
 
-    @abstractmethod
+    __slots__ = ()
+
     def scan(self) -> Any:  # pragma: no cover - interface only
         """Run an analysis scan."""
 
-    @abstractmethod
+        raise NotImplementedError(f"{type(self).__name__} does not implement scan()")
+
     def report(self, *args: Any, **kwargs: Any) -> Any:  # pragma: no cover - interface only
         """Generate and return an analysis report."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not implement report()")
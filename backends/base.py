@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from abc import ABC
-from functools import wraps
+from types import MethodType
 from typing import Any, Callable, Mapping, ParamSpec, TypeVar
 
 
@@ -9,12 +8,29 @@ P = ParamSpec("P")
 T = TypeVar("T")
 
 
-class BaseBackend(ABC):
+class BaseBackend:
     """Base class for all backend implementations."""
 
+    __slots__ = ("name", "config", "env", "_connected")
+
+    #: Whether the class implements the optional ``restore_session(payload)``
+    #: and ``export_session()`` hooks. Derived automatically for subclasses
+    #: unless they set the flag themselves.
+    supports_session_restore: bool = False
+    supports_session_export: bool = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "supports_session_restore" not in cls.__dict__:
+            cls.supports_session_restore = callable(getattr(cls, "restore_session", None))
+        if "supports_session_export" not in cls.__dict__:
+            cls.supports_session_export = callable(getattr(cls, "export_session", None))
+
     def __init__(self, name: str, config: Mapping[str, Any] | None = None, env: str | None = None) -> None:
         self.name = name
-        self.config = dict(config or {})
+        # ``get_backend`` hands over a freshly merged dict, so only copy other
+        # mappings. Callers passing their own dict must not reuse it afterwards.
+        self.config = config if type(config) is dict else dict(config or {})
         self.env = env
         self._connected = False
 
@@ -33,16 +49,30 @@ class BaseBackend(ABC):
 def require_connection(method: Callable[P, T]) -> Callable[P, T]:
     """Ensure the backend is connected before invoking ``method``.
 
-    The decorator reuses the existing connection on the instance when
-    available, otherwise it initializes it by calling ``connect``.
+    Connected instances go straight to ``method``. Otherwise ``connect`` is
+    called first, and instances with a ``__dict__`` get the undecorated method
+    bound onto them so later calls skip the wrapper entirely. Slotted
+    backends keep the wrapper, whose first check is the ``_connected`` slot.
     """
 
-    @wraps(method)
+    name = method.__name__
+
     def wrapper(self: BaseBackend, *args: P.args, **kwargs: P.kwargs) -> T:
-        if not getattr(self, "_connected", False):
-            self.connect()
-            self._connected = True
+        try:
+            connected = self._connected
+        except AttributeError:  # subclass skipped BaseBackend.__init__
+            connected = False
+        if connected:
+            return method(self, *args, **kwargs)
+
+        self.connect()
+        self._connected = True
 
+        instance_dict = getattr(self, "__dict__", None)
+        if instance_dict is not None:
+            instance_dict[name] = MethodType(method, self)
         return method(self, *args, **kwargs)
 
+    wrapper.__name__ = name
+    wrapper.__qualname__ = method.__qualname__
     return wrapper
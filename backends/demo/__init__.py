@@ -1,11 +1,39 @@
-"""Demo backends for SCM, analysis, and review domains."""
-
-from .bitbucket import BitbucketReviewBackend
-from .git import GitBackend
-from .klocwork import KlocworkAnalysisBackend
-from .p4 import P4Backend
-from .perforce_swarm import PerforceSwarmReviewBackend
-from .sonarqube import SonarqubeAnalysisBackend
+"""Demo backends for SCM, analysis, and review domains.
+
+Backends are registered by dotted path so that importing :mod:`backends` does
+not import every demo module; each one is loaded the first time it is
+requested through :func:`backends.get_backend` or accessed as an attribute of
+this package.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from ..registry import register_backend_lazy
+
+_DEMO_BACKENDS = {
+    "BitbucketReviewBackend": ("review", "bitbucket", "backends.demo.bitbucket"),
+    "GitBackend": ("scm", "git", "backends.demo.git"),
+    "KlocworkAnalysisBackend": ("analysis", "klocwork", "backends.demo.klocwork"),
+    "P4Backend": ("scm", "p4", "backends.demo.p4"),
+    "PerforceSwarmReviewBackend": ("review", "perforce-swarm", "backends.demo.perforce_swarm"),
+    "SonarqubeAnalysisBackend": ("analysis", "sonarqube", "backends.demo.sonarqube"),
+}
+
+for _cls_name, (_domain, _name, _module) in _DEMO_BACKENDS.items():
+    register_backend_lazy(_domain, _name, f"{_module}:{_cls_name}")
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_path = _DEMO_BACKENDS[name][2]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    return getattr(importlib.import_module(module_path), name)
+
 
 __all__ = [
     "BitbucketReviewBackend",
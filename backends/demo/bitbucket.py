@@ -3,13 +3,14 @@ from __future__ import annotations
 from typing import Any
 
 from ..base import require_connection
-from ..registry import register_backend
 from ..review import ReviewBackend
 
 
 class BitbucketReviewBackend(ReviewBackend):
     """Dummy Bitbucket review backend."""
 
+    __slots__ = ()
+
     def connect(self) -> None:
         self.config.setdefault("host", "https://bitbucket.example.com")
         self.config.setdefault("project_key", "DEMO")
@@ -29,6 +30,3 @@ class BitbucketReviewBackend(ReviewBackend):
     def approve(self, *args: Any, **kwargs: Any) -> str:
         message = kwargs.get("message", "")
         return f"bitbucket approve PR with message: {message}"
-
-
-register_backend("review", "bitbucket", BitbucketReviewBackend)
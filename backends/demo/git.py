@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..registry import register_backend
 from ..scm import SCMBackend
 from ..base import require_connection
 
@@ -10,6 +9,8 @@ from ..base import require_connection
 class GitBackend(SCMBackend):
     """Dummy Git SCM backend."""
 
+    __slots__ = ()
+
     def connect(self) -> None:
         self.config.setdefault("repo", "https://example.com/demo.git")
         self.config.setdefault("branch", "main")
@@ -27,6 +28,3 @@ class GitBackend(SCMBackend):
     def submit(self, *args: Any, **kwargs: Any) -> str:
         message = kwargs.get("message", "")
         return f"git push with commit message: {message}"
-
-
-register_backend("scm", "git", GitBackend)
@@ -4,12 +4,13 @@ from typing import Any
 
 from ..analysis import AnalysisBackend
 from ..base import require_connection
-from ..registry import register_backend
 
 
 class KlocworkAnalysisBackend(AnalysisBackend):
     """Dummy Klocwork analysis backend."""
 
+    __slots__ = ()
+
     def connect(self) -> None:
         self.config.setdefault("host", "https://klocwork.example.com")
         self.config.setdefault("project", "demo-project")
@@ -23,6 +24,3 @@ class KlocworkAnalysisBackend(AnalysisBackend):
     def report(self, *args: Any, **kwargs: Any) -> str:
         format_ = kwargs.get("format", "text")
         return f"klocwork report in {format_} for {self.config['project']}"
-
-
-register_backend("analysis", "klocwork", KlocworkAnalysisBackend)
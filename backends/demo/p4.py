@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..registry import register_backend
 from ..scm import SCMBackend
 from ..base import require_connection
 
@@ -10,6 +9,8 @@ from ..base import require_connection
 class P4Backend(SCMBackend):
     """Dummy Perforce SCM backend."""
 
+    __slots__ = ()
+
     def connect(self) -> None:
         self.config.setdefault("server", "perforce:1666")
         self.config.setdefault("workspace", "demo-workspace")
@@ -27,6 +28,3 @@ class P4Backend(SCMBackend):
     def submit(self, *args: Any, **kwargs: Any) -> str:
         message = kwargs.get("message", "")
         return f"p4 submit from {self.config['workspace']} with message: {message}"
-
-
-register_backend("scm", "p4", P4Backend)
@@ -3,13 +3,14 @@ from __future__ import annotations
 from typing import Any
 
 from ..base import require_connection
-from ..registry import register_backend
 from ..review import ReviewBackend
 
 
 class PerforceSwarmReviewBackend(ReviewBackend):
     """Dummy Perforce Swarm review backend."""
 
+    __slots__ = ()
+
     def connect(self) -> None:
         self.config.setdefault("host", "https://swarm.example.com")
         self.config.setdefault("project", "demo")
@@ -29,6 +30,3 @@ class PerforceSwarmReviewBackend(ReviewBackend):
     def approve(self, *args: Any, **kwargs: Any) -> str:
         message = kwargs.get("message", "")
         return f"swarm approve review with message: {message}"
-
-
-register_backend("review", "perforce-swarm", PerforceSwarmReviewBackend)
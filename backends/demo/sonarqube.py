@@ -4,12 +4,13 @@ from typing import Any
 
 from ..analysis import AnalysisBackend
 from ..base import require_connection
-from ..registry import register_backend
 
 
 class SonarqubeAnalysisBackend(AnalysisBackend):
     """Dummy SonarQube analysis backend."""
 
+    __slots__ = ()
+
     def connect(self) -> None:
         self.config.setdefault("host", "https://sonarqube.example.com")
         self.config.setdefault("project", "demo-project")
@@ -23,6 +24,3 @@ class SonarqubeAnalysisBackend(AnalysisBackend):
     def report(self, *args: Any, **kwargs: Any) -> str:
         format_ = kwargs.get("format", "text")
         return f"sonarqube report in {format_} for {self.config['project']}"
-
-
-register_backend("analysis", "sonarqube", SonarqubeAnalysisBackend)
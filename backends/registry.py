@@ -1,42 +1,155 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Dict, Mapping, MutableMapping, Type
+import bisect
+import functools
+import importlib
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple, Type, Union
 
 import click
 
 from .base import BaseBackend
 
 BackendType = Type[BaseBackend]
-BackendRegistry = MutableMapping[str, MutableMapping[str, BackendType]]
+# Registry slots are keyed by ``(domain, name)`` and hold either a backend class
+# or a ``"module:ClassName"`` path that is imported the first time the backend
+# is requested.
+BackendRegistry = Mapping[Tuple[str, str], Union[BackendType, str]]
 
 
-BACKEND_REGISTRY: BackendRegistry = {
-    "scm": {},
-    "analysis": {},
-    "review": {},
-}
+BACKEND_DOMAINS = {sys.intern("scm"), sys.intern("analysis"), sys.intern("review")}
+# Only ``register_backend``/``register_backend_lazy`` mutate ``_REGISTRY``;
+# everyone else sees the read-only ``BACKEND_REGISTRY`` view of it.
+_REGISTRY: Dict[Tuple[str, str], Union[BackendType, str]] = {}
+BACKEND_REGISTRY: BackendRegistry = MappingProxyType(_REGISTRY)
+# Registered names per domain, kept sorted for "known backends" error messages.
+_SORTED_NAMES: Dict[str, List[str]] = {}
+
+
+def _add_entry(domain: str, name: str, entry: Union[BackendType, str]) -> None:
+    domain = sys.intern(domain)
+    name = sys.intern(name)
+    BACKEND_DOMAINS.add(domain)
+    if (domain, name) not in _REGISTRY:
+        bisect.insort(_SORTED_NAMES.setdefault(domain, []), name)
+    _REGISTRY[(domain, name)] = entry
+    _lookup_backend_cls.cache_clear()
 
 
 def register_backend(domain: str, name: str, backend_cls: BackendType) -> None:
     """Register a backend implementation for a given domain."""
 
-    if domain not in BACKEND_REGISTRY:
-        BACKEND_REGISTRY[domain] = {}
+    if not (isinstance(backend_cls, type) and issubclass(backend_cls, BaseBackend)):
+        raise TypeError(f"Backend '{name}' for domain '{domain}' must subclass BaseBackend")
+
+    _add_entry(domain, name, backend_cls)
+
+
+def register_backend_lazy(domain: str, name: str, dotted_path: str) -> None:
+    """Register a backend by ``"module:ClassName"`` path without importing it.
+
+    The module is imported on the first :func:`get_backend` call for ``name``
+    and the registry slot is replaced with the resolved class.
+    """
+
+    _add_entry(domain, name, dotted_path)
+
+
+def _resolve_backend_cls(domain: str, name: str, entry: Union[BackendType, str]) -> BackendType:
+    if not isinstance(entry, str):
+        return entry
+
+    module_path, _, cls_name = entry.partition(":")
+    try:
+        backend_cls = getattr(importlib.import_module(module_path), cls_name)
+    except (ImportError, AttributeError) as exc:
+        raise click.ClickException(
+            f"Failed to load backend '{name}' for domain '{domain}' from '{entry}': {exc}"
+        ) from exc
+
+    if not (isinstance(backend_cls, type) and issubclass(backend_cls, BaseBackend)):
+        raise click.ClickException(
+            f"Backend '{name}' for domain '{domain}' loaded from '{entry}' does not subclass BaseBackend"
+        )
+
+    _REGISTRY[(domain, name)] = backend_cls
+    return backend_cls
+
+
+@functools.lru_cache(maxsize=None)
+def _lookup_backend_cls(domain: str, name: str) -> BackendType:
+    """Return the class registered for ``(domain, name)``, importing it if needed.
+
+    Memoized per process; registering a backend clears the cache.
+    """
+
+    try:
+        entry = _REGISTRY[(domain, name)]
+    except KeyError as exc:
+        if domain not in BACKEND_DOMAINS:
+            raise click.ClickException(f"Unknown backend domain '{domain}'") from exc
+
+        known = ", ".join(_SORTED_NAMES.get(domain, ())) or "none"
+        raise click.ClickException(
+            f"Backend '{name}' is not registered for domain '{domain}'. Known backends: {known}"
+        ) from exc
+
+    return _resolve_backend_cls(domain, name, entry)
+
+
+_CONFIG_CACHE_MAXSIZE = 128
 
-    BACKEND_REGISTRY[domain][name] = backend_cls
+# Merged backend configs keyed on ``(id(config), name, env)``. The source
+# mapping is stored alongside the result so an entry is only reused for the
+# very same object, never for a new mapping that happens to reuse its id.
+_CONFIG_CACHE: Dict[Tuple[int, str, str | None], Tuple[Mapping[str, Any], Dict[str, Any]]] = {}
+
+
+def clear_config_cache() -> None:
+    """Drop memoized backend configs, e.g. after mutating a loaded config."""
+
+    _CONFIG_CACHE.clear()
 
 
 def _lookup_config(config: Mapping[str, Any] | None, name: str, env: str | None = None) -> Dict[str, Any]:
-    """Fetch backend config and merge environment overrides when present."""
+    """Fetch backend config and merge environment overrides when present.
+
+    Results are memoized per config object; callers receive a shallow copy and
+    must treat nested values as read-only.
+    """
+
+    if config is None:
+        return _merge_config({}, name, env)
 
-    config = config or {}
-    base_config = deepcopy(config.get("backend_configs", {}).get(name, {}))
+    key = (id(config), name, env)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] is config:
+        return dict(cached[1])
+
+    merged = _merge_config(config, name, env)
+    if len(_CONFIG_CACHE) >= _CONFIG_CACHE_MAXSIZE:
+        _CONFIG_CACHE.pop(next(iter(_CONFIG_CACHE)))
+    _CONFIG_CACHE[key] = (config, merged)
+
+    return dict(merged)
+
+
+def _merge_config(config: Mapping[str, Any], name: str, env: str | None) -> Dict[str, Any]:
+    backend_configs = config.get("backend_configs", {})
+    if not isinstance(backend_configs, Mapping):
+        raise click.ClickException("Config 'backend_configs' section must be a mapping")
+
+    base_config = backend_configs.get(name, {})
 
     if env is None:
-        return dict(base_config)
+        return {**base_config}
+
+    envs = config.get("envs", {})
+    if not isinstance(envs, Mapping):
+        raise click.ClickException("Config 'envs' section must be a mapping")
 
-    env_overrides = config.get("envs", {}).get(env, {}).get("backend_configs", {}).get(name, {})
+    env_overrides = envs.get(env, {}).get("backend_configs", {}).get(name, {})
 
     return {**base_config, **env_overrides}
 
@@ -44,22 +157,12 @@ def _lookup_config(config: Mapping[str, Any] | None, name: str, env: str | None
 def get_backend(domain: str, name: str, config: Mapping[str, Any] | None = None, env: str | None = None) -> BaseBackend:
     """Instantiate a registered backend using configuration from ``backend_configs``.
 
-    The ``config`` mapping should correspond to ``ctx.obj["config"]`` from the CLI
+    The ``config`` mapping should correspond to ``ctx.obj.config`` from the CLI
     layer. Base backend settings are read from ``backend_configs[name]`` and merged
     with ``envs[env]["backend_configs"][name]`` when an environment is provided.
     """
 
-    if domain not in BACKEND_REGISTRY:
-        raise click.ClickException(f"Unknown backend domain '{domain}'")
-
-    try:
-        backend_cls = BACKEND_REGISTRY[domain][name]
-    except KeyError as exc:  # pragma: no cover - defensive error path
-        known = ", ".join(sorted(BACKEND_REGISTRY.get(domain, {}))) or "none"
-        raise click.ClickException(
-            f"Backend '{name}' is not registered for domain '{domain}'. Known backends: {known}"
-        ) from exc
-
+    backend_cls = _lookup_backend_cls(domain, name)
     backend_config = _lookup_config(config, name, env=env)
 
     return backend_cls(name=name, config=backend_config, env=env)
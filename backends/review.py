@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from abc import abstractmethod
 from typing import Any
 
 from .base import BaseBackend
@@ -9,14 +8,19 @@ from .base import BaseBackend
 class ReviewBackend(BaseBackend):
     """Interface for review backends."""
 
-    @abstractmethod
+    __slots__ = ()
+
     def create_review(self, *args: Any, **kwargs: Any) -> Any:  # pragma: no cover - interface only
         """Create a review or review request."""
 
-    @abstractmethod
+        raise NotImplementedError(f"{type(self).__name__} does not implement create_review()")
+
     def comment(self, *args: Any, **kwargs: Any) -> Any:  # pragma: no cover - interface only
         """Create a comment on a review or change."""
 
-    @abstractmethod
+        raise NotImplementedError(f"{type(self).__name__} does not implement comment()")
+
     def approve(self, *args: Any, **kwargs: Any) -> Any:  # pragma: no cover - interface only
         """Approve a review or change."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not implement approve()")
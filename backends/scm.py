@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from abc import abstractmethod
 from typing import Any
 
 from .base import BaseBackend
@@ -9,14 +8,19 @@ from .base import BaseBackend
 class SCMBackend(BaseBackend):
     """Interface for source control management backends."""
 
-    @abstractmethod
+    __slots__ = ()
+
     def sync(self) -> Any:  # pragma: no cover - interface only
         """Synchronize the working tree."""
 
-    @abstractmethod
+        raise NotImplementedError(f"{type(self).__name__} does not implement sync()")
+
     def status(self) -> Any:  # pragma: no cover - interface only
         """Return status information for the working tree."""
 
-    @abstractmethod
+        raise NotImplementedError(f"{type(self).__name__} does not implement status()")
+
     def submit(self, *args: Any, **kwargs: Any) -> Any:  # pragma: no cover - interface only
         """Submit changes to the remote repository or review system."""
+
+        raise NotImplementedError(f"{type(self).__name__} does not implement submit()")
@@ -1,54 +1,98 @@
+from __future__ import annotations
+
+import functools
+import json
 import pathlib
-from typing import Any, Dict, Mapping
+from typing import IO, Any, Dict, Mapping
 
 import click
-import yaml
 
-from command_groups import register_command_groups
+from command_groups import LazyGroup, register_command_groups
+from command_groups.steps import tokenize_workflows
+import config_cache
 from context_state import ContextState
 from logging_utils import configure_logging, get_logger
-from runners import get_runner
-from session_cache import SessionCache
-from telemetry import TelemetryCollector
 
 
 DEFAULT_ENV = "local"
 DEFAULT_CONFIG_FILENAME = "config.yaml"
 
 
-def _validate_config_shape(config: Mapping[str, Any]) -> None:
-    if not isinstance(config, Mapping):
-        raise click.ClickException("Config file must contain a YAML mapping")
+@functools.lru_cache(maxsize=None)
+def _yaml_loader() -> Any:
+    """Return libyaml's C loader when PyYAML was built with it.
+
+    ``yaml`` is imported on first use so that runs served from the config
+    cache never load it. The bundled JSON-backed ``yaml`` fallback only offers
+    ``safe_load``, in which case ``None`` is returned.
+    """
+
+    import yaml
 
-    backends_section = config.get("backends")
-    if backends_section is not None and not isinstance(backends_section, Mapping):
-        raise click.ClickException("Config 'backends' section must be a mapping")
+    return getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
 
-    backend_configs = config.get("backend_configs")
-    if backend_configs is not None and not isinstance(backend_configs, Mapping):
-        raise click.ClickException("Config 'backend_configs' section must be a mapping")
 
-    envs_section = config.get("envs")
-    if envs_section is not None and not isinstance(envs_section, Mapping):
-        raise click.ClickException("Config 'envs' section must be a mapping")
+def _load_yaml(stream: Any) -> Any:
+    import yaml
 
-    workflows_section = config.get("workflows")
-    if workflows_section is not None and not isinstance(workflows_section, Mapping):
-        raise click.ClickException("Config 'workflows' section must be a mapping")
+    loader = _yaml_loader()
+    if loader is None:
+        return yaml.safe_load(stream)
+
+    return yaml.load(stream, Loader=loader)
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
     path = pathlib.Path(config_path)
-    if not path.exists():
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
         return {}
 
-    try:
+    if not stat_result.st_size:
+        return {}
+
+    # The cache holds the mapping as parsed; workflow steps are tokenized on
+    # every load so tokenizer changes never serve stale argument lists.
+    data = config_cache.load(path, stat_result)
+    if data is None:
         with path.open("r", encoding="utf-8") as config_file:
-            data = yaml.safe_load(config_file) or {}
-    except yaml.YAMLError as exc:
-        raise click.ClickException(f"Failed to parse config file: {exc}") from exc
+            data = _read_config(config_file, json_format=path.suffix == ".json")
+        config_cache.store(path, stat_result, data)
+
+    tokenize_workflows(data)
+    return data
+
+
+def parse_config(stream: str | IO[str], *, json_format: bool = False) -> Dict[str, Any]:
+    """Parse config YAML from ``stream`` without touching the on-disk cache.
 
-    _validate_config_shape(data)
+    With ``json_format`` the stream is read by the stdlib JSON parser instead,
+    and ``yaml`` is not imported.
+    """
+
+    data = _read_config(stream, json_format=json_format)
+    tokenize_workflows(data)
+    return data
+
+
+def _read_config(stream: str | IO[str], *, json_format: bool = False) -> Dict[str, Any]:
+    if json_format:
+        try:
+            data = (json.loads(stream) if isinstance(stream, str) else json.load(stream)) or {}
+        except ValueError as exc:
+            raise click.ClickException(f"Failed to parse config file: {exc}") from exc
+    else:
+        import yaml
+
+        try:
+            data = _load_yaml(stream) or {}
+        except yaml.YAMLError as exc:
+            raise click.ClickException(f"Failed to parse config file: {exc}") from exc
+
+    # Section shapes are checked where each section is consumed.
+    if not isinstance(data, Mapping):
+        raise click.ClickException("Config file must contain a YAML mapping")
 
     return data
 
@@ -60,7 +104,7 @@ def _default_config_path() -> pathlib.Path:
 logger = get_logger(__name__)
 
 
-@click.group(invoke_without_command=True)
+@click.group(cls=LazyGroup, invoke_without_command=True)
 @click.option("--verbose", is_flag=True, help="Enable verbose logging output")
 @click.option("--quiet", is_flag=True, help="Reduce logging output to errors only")
 @click.pass_context
@@ -70,27 +114,44 @@ def cli(ctx: click.Context, verbose: bool, quiet: bool) -> None:
     if state.initialized:
         return
 
+    initialize_state(state, config_path=_default_config_path(), verbose=verbose, quiet=quiet)
+    # Session updates from every command and workflow step are written once,
+    # when the root context closes.
+    ctx.call_on_close(state.flush_session_cache)
+
+
+def initialize_state(
+    state: ContextState,
+    *,
+    config_path: pathlib.Path,
+    env: str = DEFAULT_ENV,
+    verbose: bool = False,
+    quiet: bool = False,
+) -> ContextState:
+    """Populate ``state`` from the config at ``config_path``; the root callback's body."""
+
+    # Deferred so that importing ``cli`` does not pull in ``subprocess``.
+    from runners import get_runner
+
     if verbose and quiet:
         raise click.ClickException("--verbose and --quiet are mutually exclusive")
 
-    config_path = _default_config_path()
     configuration = load_config(str(config_path))
     configure_logging(verbose=verbose, quiet=quiet)
     logger.debug("Loaded configuration from %s", config_path)
 
-    env = DEFAULT_ENV
-    runner = get_runner(env, configuration)
-
     state.config = configuration
     state.env = env
     state.sessions = {}
-    state.runner = runner
+    state.runner = get_runner(env, configuration)
     state.workflow_state = {}
     state.verbose = verbose
     state.quiet = quiet
-    state.session_cache = SessionCache.from_config(configuration)
-    state.telemetry = TelemetryCollector()
+    # The session cache and telemetry collector are created on first use.
+    state.session_cache = None
+    state.telemetry = None
     state.initialized = True
+    return state
 
 
 register_command_groups(cli)
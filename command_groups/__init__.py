@@ -1,13 +1,57 @@
-from .analysis import analysis
-from .review import review
-from .scm import scm
-from .workflow import workflow
+"""Command groups attached to the root ``cli`` group.
 
-__all__ = ["analysis", "review", "scm", "workflow"]
+Each group module is imported only when its command is looked up, so an
+invocation such as ``workflow run`` does not import the SCM, analysis, or
+review commands (or the backends they use) unless a step needs them.
+"""
 
+from __future__ import annotations
 
-def register_command_groups(cli) -> None:
-    cli.add_command(scm)
-    cli.add_command(analysis)
-    cli.add_command(review)
-    cli.add_command(workflow)
+import importlib
+from typing import Any, Dict, List, Optional
+
+import click
+
+_COMMAND_GROUPS = {
+    "scm": "command_groups.scm:scm",
+    "analysis": "command_groups.analysis:analysis",
+    "review": "command_groups.review:review",
+    "workflow": "command_groups.workflow:workflow",
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports registered subcommands on first lookup."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: Dict[str, str] = {}
+
+    def add_lazy_command(self, name: str, import_path: str) -> None:
+        """Register ``"module:attribute"`` to be imported when ``name`` is used."""
+
+        self.lazy_commands[name] = import_path
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in self.lazy_commands:
+            module_path, _, attribute = self.lazy_commands[cmd_name].partition(":")
+            command = getattr(importlib.import_module(module_path), attribute)
+            self.add_command(command, cmd_name)
+
+        return command
+
+
+def register_command_groups(cli: click.Group) -> None:
+    for name, import_path in _COMMAND_GROUPS.items():
+        if isinstance(cli, LazyGroup):
+            cli.add_lazy_command(name, import_path)
+        else:
+            module_path, _, attribute = import_path.partition(":")
+            cli.add_command(getattr(importlib.import_module(module_path), attribute), name)
+
+
+__all__ = ["LazyGroup", "register_command_groups"]
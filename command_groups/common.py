@@ -1,93 +1,139 @@
 from __future__ import annotations
 
-import functools
-import shlex
-from typing import Any, Callable, Iterable, List, Mapping
+import copy
+from typing import Any, Callable, Mapping
 
 import click
 
 from backends import get_backend
+from command_groups.steps import normalize_step  # noqa: F401  Re-exported for existing imports
 from context_state import ContextState
 from logging_utils import get_logger
 
 logger = get_logger(__name__)
 
 
-def ensure_session(domain: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-    """Ensure a connected backend session exists for ``domain``."""
+def ensure_session(
+    domain: str, event: str | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Ensure a connected backend session exists for ``domain``.
+
+    The decorated command receives the current Click context as its first
+    argument. Once a backend is connected the wrapper only performs a single
+    membership check on ``ctx.obj.sessions``. When ``event`` is given, the
+    command's duration and outcome are recorded under that telemetry name.
+    """
 
     def decorator(command: Callable[..., Any]) -> Callable[..., Any]:
-        @click.pass_context
-        @functools.wraps(command)
-        def wrapper(ctx: click.Context, *args: Any, **kwargs: Any) -> Any:
-            ctx.ensure_object(ContextState)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            ctx = click.get_current_context()
             state: ContextState = ctx.obj
-            sessions = state.sessions
-
-            if domain not in sessions:
-                config = state.config or {}
-                backends_config = config.get("backends")
-
-                if backends_config is None:
-                    raise click.ClickException("Config is missing required 'backends' section")
-
-                if not isinstance(backends_config, dict):
-                    raise click.ClickException("Config 'backends' section must be a mapping")
-
-                try:
-                    backend_name = backends_config[domain]
-                except KeyError as exc:
-                    raise click.ClickException(
-                        f"No backend configured for domain '{domain}'"
-                    ) from exc
-
-                backend = get_backend(
-                    domain,
-                    backend_name,
-                    config=config,
-                    env=state.env,
-                )
-
-                cached_session = state.session_cache.get(domain)
-                if cached_session and hasattr(backend, "restore_session"):
-                    try:
-                        backend.restore_session(cached_session)
-                        logger.debug("Restored cached session for domain '%s'", domain)
-                    except Exception as exc:  # pragma: no cover - defensive
-                        logger.debug("Failed to restore cached session: %s", exc)
-
-                try:
-                    backend.connect()
-                except click.ClickException:
-                    raise
-                except Exception as exc:
-                    raise click.ClickException(
-                        f"Failed to connect to backend '{backend_name}' for domain '{domain}': {exc}"
-                    ) from exc
-
-                if hasattr(backend, "export_session"):
-                    try:
-                        exported = backend.export_session()
-                        state.session_cache.set(domain, exported)
-                        state.session_cache.persist()
-                    except Exception as exc:  # pragma: no cover - defensive
-                        logger.debug("Failed to export session for caching: %s", exc)
-
-                sessions[domain] = backend
-                logger.debug("Connected backend '%s' for domain '%s'", backend_name, domain)
-
-            return command(ctx, *args, **kwargs)
+            # The root ``cli`` callback is the only place that creates ctx.obj.
+            assert state is not None, "ensure_session requires the root cli context"
+            if domain not in state.sessions:
+                _connect(state, domain)
 
-        return wrapper
+            if event is None:
+                return command(ctx, *args, **kwargs)
 
-    return decorator
+            with state.telemetry.track(event):
+                return command(ctx, *args, **kwargs)
 
+        wrapper.__name__ = command.__name__
+        wrapper.__doc__ = command.__doc__
+        if hasattr(command, "__click_params__"):
+            wrapper.__click_params__ = command.__click_params__  # type: ignore[attr-defined]
 
-def normalize_step(step: Any) -> List[str]:
-    if isinstance(step, str):
-        return shlex.split(step)
+        return wrapper
+
+    return decorator
 
-    if isinstance(step, Iterable):
-        return [str(part) for part in step]
 
-    raise click.ClickException("Workflow steps must be strings or iterables of arguments")
+def announce(ctx: click.Context, message: str, *args: Any) -> None:
+    """Echo a command banner unless ``--quiet`` was given.
+
+    ``message`` is %-formatted with ``args`` only when the banner is printed.
+    """
+
+    if ctx.obj.quiet:
+        return
+
+    click.echo(message % args if args else message)
+
+
+def _connect(state: ContextState, domain: str) -> Any:
+    """Resolve, connect, and store the backend for ``domain`` on ``state``."""
+
+    config = state.config or {}
+    backends_config = config.get("backends")
+
+    if backends_config is None:
+        raise click.ClickException("Config is missing required 'backends' section")
+
+    if not isinstance(backends_config, Mapping):
+        raise click.ClickException("Config 'backends' section must be a mapping")
+
+    try:
+        backend_name = backends_config[domain]
+    except KeyError as exc:
+        raise click.ClickException(
+            f"No backend configured for domain '{domain}'"
+        ) from exc
+
+    backend = get_backend(
+        domain,
+        backend_name,
+        config=config,
+        env=state.env,
+    )
+
+    session_cache = state.session_cache
+    cached_session = session_cache.get(domain)
+    if cached_session and backend.supports_session_restore:
+        try:
+            # A private copy, so a backend refreshing it in place still
+            # registers as a change when it exports the session again.
+            backend.restore_session(copy.deepcopy(cached_session))
+            logger.debug("Restored cached session for domain '%s'", domain)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to restore cached session: %s", exc)
+
+    fingerprint = None
+    config_updates = None
+    if session_cache.connection_ttl > 0:
+        configured = dict(backend.config)
+        fingerprint = session_cache.fingerprint(domain, backend_name, backend.config)
+        config_updates = session_cache.get_connection(domain, backend_name, fingerprint)
+
+    if config_updates is not None:
+        backend.config = {**backend.config, **config_updates}
+        backend._connected = True
+        logger.debug("Reusing cached connection for domain '%s'", domain)
+    else:
+        try:
+            backend.connect()
+        except click.ClickException:
+            raise
+        except Exception as exc:
+            raise click.ClickException(
+                f"Failed to connect to backend '{backend_name}' for domain '{domain}': {exc}"
+            ) from exc
+
+        if fingerprint is not None:
+            config_updates = {
+                key: value
+                for key, value in backend.config.items()
+                if key not in configured or configured[key] != value
+            }
+            session_cache.set_connection(domain, backend_name, fingerprint, config_updates)
+
+    if backend.supports_session_export:
+        try:
+            exported = backend.export_session()
+            session_cache.set(domain, exported)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to export session for caching: %s", exc)
+
+    state.sessions[domain] = backend
+    logger.debug("Connected backend '%s' for domain '%s'", backend_name, domain)
+    return backend
@@ -0,0 +1,66 @@
+"""Workflow step tokenization helpers.
+
+Kept apart from :mod:`command_groups.common` so that config loading can use
+them without importing the backends package.
+"""
+
+from __future__ import annotations
+
+import shlex
+from typing import Any, List, Mapping
+
+import click
+
+_SHELL_SYNTAX_CHARS = ("'", '"', "\\")
+# shlex only separates on these; ``str.split()`` would also split on other
+# (including non-ASCII) whitespace such as no-break spaces.
+_SHELL_WHITESPACE = str.maketrans("\t\r\n", "   ")
+
+
+def split_step(step: str) -> List[str]:
+    """Split a string workflow step into arguments.
+
+    ``shlex`` is only needed for quoting and escapes; other steps are split
+    on the same whitespace characters with the much cheaper ``str.split``.
+    """
+
+    if any(char in step for char in _SHELL_SYNTAX_CHARS):
+        return shlex.split(step)
+
+    return [part for part in step.translate(_SHELL_WHITESPACE).split(" ") if part]
+
+
+def tokenize_workflows(config: Mapping[str, Any]) -> None:
+    """Replace string workflow steps in ``config`` with their argument lists.
+
+    Malformed sections are left untouched for ``workflow run`` to report.
+    """
+
+    workflows = config.get("workflows")
+    if not isinstance(workflows, Mapping):
+        return
+
+    for steps in workflows.values():
+        if isinstance(steps, list):
+            for index, step in enumerate(steps):
+                if isinstance(step, str):
+                    steps[index] = split_step(step)
+
+
+def normalize_step(step: Any) -> List[str]:
+    """Return the arguments of a workflow step.
+
+    Lists that already hold only strings, as produced by YAML and by
+    :func:`tokenize_workflows`, are returned as-is; callers must not mutate them.
+    """
+
+    if type(step) is list and all(type(part) is str for part in step):
+        return step
+
+    if isinstance(step, str):
+        return split_step(step)
+
+    if isinstance(step, (list, tuple)):
+        return [str(part) for part in step]
+
+    raise click.ClickException("Workflow steps must be strings or lists of arguments")
@@ -1,13 +1,83 @@
+from typing import Any, Dict, List, Tuple, Union
+
 import click
 
-from command_groups.common import normalize_step
+from command_groups.common import announce
+from command_groups.steps import normalize_step
 from context_state import ContextState
 
 
 @click.group()
-@click.pass_context
-def workflow(ctx: click.Context) -> None:
-    ctx.ensure_object(ContextState)
+def workflow() -> None:
+    pass
+
+
+StepTarget = Tuple[click.Command, str, List[str]]
+
+
+def _resolve_step(ctx: click.Context, root_command: click.Command, step_args: List[str]) -> StepTarget:
+    """Resolve a workflow step to the top-level command that should run it.
+
+    Only the first argument is looked up, on the root group, so the root group
+    is not re-entered while nested groups still run their own callbacks when
+    the step is invoked. Steps that start with root-level options resolve to
+    the root group itself.
+    """
+
+    if step_args[0].startswith("-") or not isinstance(root_command, click.Group):
+        return root_command, "cli", list(step_args)
+
+    command = root_command.get_command(ctx, step_args[0])
+    if command is None:
+        raise click.UsageError(f"No such command '{step_args[0]}'.")
+
+    return command, step_args[0], list(step_args[1:])
+
+
+def _compile_workflow(
+    ctx: click.Context, root_command: click.Command, raw_steps: List[Any]
+) -> List[Tuple[int, List[str], Union[StepTarget, click.UsageError]]]:
+    """Build the dispatch plan for a workflow before any step runs.
+
+    Resolution errors are kept in the plan rather than raised, so they are
+    reported against their step and honour ``--continue-on-error``. Steps
+    repeated within a workflow are resolved once and share their target.
+    """
+
+    plan = []
+    resolved: Dict[Tuple[str, ...], Union[StepTarget, click.UsageError]] = {}
+    for index, raw_step in enumerate(raw_steps, start=1):
+        step_args = normalize_step(raw_step)
+        if not step_args:
+            continue
+
+        key = tuple(step_args)
+        target = resolved.get(key)
+        if target is None:
+            try:
+                target = _resolve_step(ctx, root_command, step_args)
+            except click.UsageError as exc:
+                target = exc
+            resolved[key] = target
+        plan.append((index, step_args, target))
+
+    return plan
+
+
+def _make_step_context(ctx: click.Context, root_command: click.Command, target: StepTarget) -> click.Context:
+    """Build the context for a resolved step as a child of the root context.
+
+    Parenting to the root keeps each step's command path (and so its usage
+    and help text) the same as when it is run directly. Click's parser
+    consumes the argument list it is given, so each context gets its own copy
+    of the (possibly shared) target arguments.
+    """
+
+    command, info_name, args = target
+    if command is root_command:
+        return root_command.make_context("cli", list(args), obj=ctx.obj)
+
+    return command.make_context(info_name, list(args), parent=ctx.find_root())
 
 
 @workflow.command("run")
@@ -35,17 +105,18 @@ def workflow_run(ctx: click.Context, name: str, continue_on_error: bool) -> None
 
     root_command = ctx.find_root().command
 
-    click.echo(f"[workflow] Running '{name}' with {len(raw_steps)} step(s)")
-    failures = 0
-    for index, raw_step in enumerate(raw_steps, start=1):
-        step_args = normalize_step(raw_step)
-        if not step_args:
-            continue
+    plan = _compile_workflow(ctx, root_command, raw_steps)
 
+    announce(ctx, "[workflow] Running '%s' with %d step(s)", name, len(raw_steps))
+    failures = 0
+    for index, step_args, target in plan:
         try:
-            with root_command.make_context("cli", step_args, obj=ctx.obj) as step_ctx:
+            if isinstance(target, click.UsageError):
+                raise target
+
+            with _make_step_context(ctx, root_command, target) as step_ctx:
                 with state.telemetry.track(f"workflow.step.{name}.{index}"):
-                    root_command.invoke(step_ctx)
+                    step_ctx.command.invoke(step_ctx)
         except click.ClickException as exc:
             failures += 1
             click.echo(
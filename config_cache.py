@@ -0,0 +1,92 @@
+"""On-disk cache of parsed configuration files.
+
+Parsing YAML is the most expensive step of CLI startup, yet the config file
+rarely changes between invocations. After a successful parse the resulting
+mapping is marshalled under the user cache directory together with the source
+file's ``st_mtime_ns`` and ``st_size``; later runs unmarshal it instead of
+re-parsing YAML as long as both still match. The marshalled bytes are also
+kept in memory, so repeated loads within one process skip the cache file too.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import pathlib
+import sys
+import tempfile
+from typing import Any, Dict
+
+from logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR_ENV = "BUILDHELPER_CACHE_DIR"
+DEFAULT_CACHE_DIR = pathlib.Path.home() / ".cache" / "buildhelper"
+
+# Marshalled entries per resolved cache file, mirroring what is on disk.
+# Callers get a fresh object from every load, so they may mutate it.
+_MEMORY: Dict[pathlib.Path, bytes] = {}
+
+# Part of every cache file name; bump it whenever the cached shape changes so
+# entries written by older releases are ignored. Version 2 stores untokenized
+# workflow steps.
+CACHE_FORMAT = 2
+
+
+def cache_dir() -> pathlib.Path:
+    override = os.environ.get(CACHE_DIR_ENV)
+    return pathlib.Path(override) if override else DEFAULT_CACHE_DIR
+
+
+def _cache_file(path: pathlib.Path) -> pathlib.Path:
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+    # marshal's format is only guaranteed within one interpreter version.
+    return cache_dir() / f"config-{digest}.v{CACHE_FORMAT}.{sys.implementation.cache_tag}.marshal"
+
+
+def load(path: pathlib.Path, stat_result: os.stat_result) -> Any | None:
+    """Return the cached parse of ``path`` or ``None`` when missing or stale."""
+
+    target = _cache_file(path)
+    try:
+        encoded = _MEMORY.get(target)
+        if encoded is None:
+            encoded = target.read_bytes()
+        mtime_ns, size, data = marshal.loads(encoded)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if mtime_ns != stat_result.st_mtime_ns or size != stat_result.st_size:
+        return None
+
+    _MEMORY[target] = encoded
+    return data
+
+
+def clear_memory() -> None:
+    """Forget the in-process copies; the cache files are left alone."""
+
+    _MEMORY.clear()
+
+
+def store(path: pathlib.Path, stat_result: os.stat_result, data: Any) -> None:
+    """Cache ``data`` for ``path``; values marshal cannot represent are skipped."""
+
+    try:
+        encoded = marshal.dumps((stat_result.st_mtime_ns, stat_result.st_size, data))
+
+        target = _cache_file(path)
+        _MEMORY[target] = encoded
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(encoded)
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except (OSError, ValueError) as exc:
+        logger.debug("Failed to cache parsed config %s: %s", path, exc)
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any, Dict, Iterator, MutableMapping
+from dataclasses import InitVar, dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, MutableMapping
 
-from session_cache import SessionCache
-from telemetry import TelemetryCollector
+if TYPE_CHECKING:  # pragma: no cover - imported on first use at runtime
+    from session_cache import SessionCache
+    from telemetry import TelemetryCollector
 
+_KEYS = (
+    "config",
+    "env",
+    "sessions",
+    "runner",
+    "workflow_state",
+    "verbose",
+    "quiet",
+    "session_cache",
+    "telemetry",
+    "initialized",
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class ContextState(MutableMapping[str, Any]):
     """Typed wrapper around Click's context store."""
 
@@ -18,40 +32,68 @@ class ContextState(MutableMapping[str, Any]):
     workflow_state: Dict[str, Any] = field(default_factory=dict)
     verbose: bool = False
     quiet: bool = False
-    session_cache: SessionCache = field(default_factory=SessionCache)
-    telemetry: TelemetryCollector = field(default_factory=TelemetryCollector)
+    # Accepted by the constructor and kept in the private slots below; the
+    # public names are the lazily creating properties attached after the class.
+    session_cache: InitVar[SessionCache | None] = None
+    telemetry: InitVar[TelemetryCollector | None] = None
     initialized: bool = False
+    _session_cache: SessionCache | None = field(default=None, init=False, repr=False)
+    _telemetry: TelemetryCollector | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self, session_cache: SessionCache | None, telemetry: TelemetryCollector | None) -> None:
+        self._session_cache = session_cache
+        self._telemetry = telemetry
+
+    def _get_session_cache(self) -> SessionCache:
+        """Session cache for the loaded config, created on first access."""
+
+        if self._session_cache is None:
+            from session_cache import SessionCache
+
+            self._session_cache = SessionCache.from_config(self.config)
+        return self._session_cache
+
+    def _set_session_cache(self, value: SessionCache | None) -> None:
+        self._session_cache = value
+
+    def _get_telemetry(self) -> TelemetryCollector:
+        """Telemetry collector, created on first access."""
+
+        if self._telemetry is None:
+            from telemetry import TelemetryCollector
+
+            self._telemetry = TelemetryCollector()
+        return self._telemetry
+
+    def _set_telemetry(self, value: TelemetryCollector | None) -> None:
+        self._telemetry = value
+
+    def flush_session_cache(self) -> None:
+        """Write pending session updates, if a session cache was ever created."""
+
+        if self._session_cache is not None:
+            self._session_cache.flush_if_dirty()
 
     def __getitem__(self, key: str) -> Any:
+        if key not in _KEYS:
+            raise KeyError(key)
         return getattr(self, key)
 
     def __setitem__(self, key: str, value: Any) -> None:
+        if key not in _KEYS:
+            raise KeyError(key)
         setattr(self, key, value)
 
     def __delitem__(self, key: str) -> None:
-        if hasattr(self, key):
-            setattr(self, key, None)
-        else:  # pragma: no cover - defensive
+        if key not in _KEYS:
             raise KeyError(key)
+        setattr(self, key, None)
 
     def __iter__(self) -> Iterator[str]:
-        return iter(
-            [
-                "config",
-                "env",
-                "sessions",
-                "runner",
-                "workflow_state",
-                "verbose",
-                "quiet",
-                "session_cache",
-                "telemetry",
-                "initialized",
-            ]
-        )
+        return iter(_KEYS)
 
     def __len__(self) -> int:
-        return len(list(iter(self)))
+        return len(_KEYS)
 
     def ensure(self) -> "ContextState":
         """Compatibility helper mirroring ``ctx.ensure_object`` semantics."""
@@ -59,15 +101,14 @@ class ContextState(MutableMapping[str, Any]):
         return self
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "config": self.config,
-            "env": self.env,
-            "sessions": self.sessions,
-            "runner": self.runner,
-            "workflow_state": self.workflow_state,
-            "verbose": self.verbose,
-            "quiet": self.quiet,
-            "session_cache": self.session_cache,
-            "telemetry": self.telemetry,
-            "initialized": self.initialized,
-        }
+        return {key: getattr(self, key) for key in _KEYS}
+
+
+# Attached after the dataclass is built so the InitVar defaults above stay plain
+# ``None`` rather than the property objects.
+ContextState.session_cache = property(  # type: ignore[assignment]
+    ContextState._get_session_cache, ContextState._set_session_cache, doc=ContextState._get_session_cache.__doc__
+)
+ContextState.telemetry = property(  # type: ignore[assignment]
+    ContextState._get_telemetry, ContextState._set_telemetry, doc=ContextState._get_telemetry.__doc__
+)
@@ -3,7 +3,8 @@
 The module centralizes logging configuration so that the ``--verbose`` and
 ``--quiet`` flags behave consistently across commands. ``configure_logging`` is
 idempotent and safe to call multiple times because it only attaches handlers
-when none are configured yet.
+when none are configured yet, and returns immediately when the root logger
+already has a handler and the requested level.
 """
 
 from __future__ import annotations
@@ -23,10 +24,14 @@ def configure_logging(*, verbose: bool = False, quiet: bool = False) -> None:
     elif quiet:
         level = logging.ERROR
 
-    if not logging.getLogger().handlers:
+    root_logger = logging.getLogger()
+    if root_logger.level == level and root_logger.handlers:
+        return
+
+    if not root_logger.handlers:
         logging.basicConfig(level=level, format=DEFAULT_LOG_FORMAT)
-    else:  # pragma: no cover - defensive branch for embedded runtimes
-        logging.getLogger().setLevel(level)
+    else:
+        root_logger.setLevel(level)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -7,9 +7,20 @@ from logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Entry-point groups already scanned in this process. A group is recorded
+# before its plugins load, so loaders that call back in do not rescan it.
+_DISCOVERED: set[str] = set()
+
 
 def discover_plugins(entry_point_group: str = "buildhelper.plugins") -> None:
-    """Load plugin entry points to register external command groups/backends."""
+    """Load plugin entry points to register external command groups/backends.
+
+    Each group is scanned at most once per process; later calls are no-ops.
+    """
+
+    if entry_point_group in _DISCOVERED:
+        return
+    _DISCOVERED.add(entry_point_group)
 
     try:
         raw_entries = metadata.entry_points()
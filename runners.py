@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import functools
 import shlex
 import subprocess
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Callable, Dict, Iterable, Mapping
 
 import click
 
@@ -40,10 +41,11 @@ class DockerRunner(Runner):
         self.container = container or "app"
         self.docker_bin = docker_bin
         self.default_kwargs = dict(default_kwargs or {})
+        self._prefix: tuple[str, ...] = (self.docker_bin, "exec", self.container)
 
     def run_command(self, cmd: str | Iterable[str], **kwargs: Any) -> subprocess.CompletedProcess:
         merged_kwargs = {"check": True, "text": True, **self.default_kwargs, **kwargs}
-        command = [self.docker_bin, "exec", self.container, *_normalize_cmd(cmd)]
+        command = self._prefix + _normalize_cmd(cmd)
         return subprocess.run(command, **merged_kwargs)
 
 
@@ -63,51 +65,84 @@ class K8sRunner(Runner):
         self.namespace = namespace
         self.kubectl_bin = kubectl_bin
         self.default_kwargs = dict(default_kwargs or {})
+        if self.namespace:
+            self._prefix: tuple[str, ...] = (self.kubectl_bin, "-n", self.namespace, "exec", self.pod, "--")
+        else:
+            self._prefix = (self.kubectl_bin, "exec", self.pod, "--")
 
     def run_command(self, cmd: str | Iterable[str], **kwargs: Any) -> subprocess.CompletedProcess:
         merged_kwargs = {"check": True, "text": True, **self.default_kwargs, **kwargs}
-        command: list[str] = [self.kubectl_bin, "exec", self.pod, "--", *_normalize_cmd(cmd)]
+        command = self._prefix + _normalize_cmd(cmd)
+        return subprocess.run(command, **merged_kwargs)
 
-        if self.namespace:
-            command = [self.kubectl_bin, "-n", self.namespace, "exec", self.pod, "--", *_normalize_cmd(cmd)]
 
-        return subprocess.run(command, **merged_kwargs)
+@functools.lru_cache(maxsize=256)
+def _split_cmd(cmd: str) -> tuple[str, ...]:
+    return tuple(shlex.split(cmd))
+
 
+def _normalize_cmd(cmd: str | Iterable[str]) -> tuple[str, ...]:
+    if type(cmd) is tuple:
+        return cmd
 
-def _normalize_cmd(cmd: str | Iterable[str]) -> Sequence[str]:
     if isinstance(cmd, str):
-        return tuple(shlex.split(cmd))
+        return _split_cmd(cmd)
 
     return tuple(cmd)
 
 
+def _make_local(env: str, env_config: Mapping[str, Any]) -> Runner:
+    return LocalRunner(env, default_kwargs=env_config)
+
+
+def _make_docker(env: str, env_config: Mapping[str, Any]) -> Runner:
+    default_kwargs = {k: v for k, v in env_config.items() if k not in {"container", "docker_bin"}}
+    return DockerRunner(
+        env,
+        container=env_config.get("container"),
+        docker_bin=env_config.get("docker_bin", "docker"),
+        default_kwargs=default_kwargs,
+    )
+
+
+def _make_k8s(env: str, env_config: Mapping[str, Any]) -> Runner:
+    default_kwargs = {k: v for k, v in env_config.items() if k not in {"pod", "namespace", "kubectl_bin"}}
+    return K8sRunner(
+        env,
+        pod=env_config.get("pod"),
+        namespace=env_config.get("namespace"),
+        kubectl_bin=env_config.get("kubectl_bin", "kubectl"),
+        default_kwargs=default_kwargs,
+    )
+
+
+_RUNNER_FACTORIES: Dict[str, Callable[[str, Mapping[str, Any]], Runner]] = {
+    "local": _make_local,
+    "docker": _make_docker,
+    "k8s": _make_k8s,
+    "kubernetes": _make_k8s,
+}
+
+
+def register_runner(runner_type: str, factory: Callable[[str, Mapping[str, Any]], Runner]) -> None:
+    """Register ``factory(env, runner_config)`` for ``envs.<env>.runner.type``."""
+
+    _RUNNER_FACTORIES[runner_type] = factory
+
+
 def get_runner(env: str, config: Mapping[str, Any] | None = None) -> Runner:
     """Instantiate a runner based on the requested environment."""
 
-    env_config = (config or {}).get("envs", {}).get(env, {}).get("runner", {})
+    envs = (config or {}).get("envs", {})
+    if not isinstance(envs, Mapping):
+        raise click.ClickException("Config 'envs' section must be a mapping")
+
+    env_config = envs.get(env, {}).get("runner", {})
     runner_type = env_config.get("type", env)
 
-    if runner_type == "local":
-        return LocalRunner(env, default_kwargs=env_config)
-
-    if runner_type == "docker":
-        default_kwargs = {k: v for k, v in env_config.items() if k not in {"container", "docker_bin"}}
-        return DockerRunner(
-            env,
-            container=env_config.get("container"),
-            docker_bin=env_config.get("docker_bin", "docker"),
-            default_kwargs=default_kwargs,
-        )
-
-    if runner_type in {"k8s", "kubernetes"}:
-        default_kwargs = {k: v for k, v in env_config.items() if k not in {"pod", "namespace", "kubectl_bin"}}
-        return K8sRunner(
-            env,
-            pod=env_config.get("pod"),
-            namespace=env_config.get("namespace"),
-            kubectl_bin=env_config.get("kubectl_bin", "kubectl"),
-            default_kwargs=default_kwargs,
-        )
+    factory = _RUNNER_FACTORIES.get(runner_type)
+    if factory is not None:
+        return factory(env, env_config)
 
     if env_config:
         raise click.ClickException(f"Unknown environment '{runner_type}'")
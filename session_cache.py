@@ -1,51 +1,253 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import marshal
+import os
 import pathlib
-from typing import Any, Dict, Mapping
+import tempfile
+import time
+from typing import Any, Dict, Mapping, Tuple
 
-import yaml
+import click
 
-DEFAULT_CACHE_PATH = pathlib.Path.home() / ".buildhelper" / "sessions.yaml"
+from logging_utils import get_logger
+
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = pathlib.Path.home() / ".buildhelper" / "sessions.json"
+# Default location used by older releases; read once and migrated on close.
+LEGACY_CACHE_PATH = pathlib.Path.home() / ".buildhelper" / "sessions.yaml"
+CONNECTIONS_KEY = "_connections"
+
+# Parsed cache files per path, with the (st_mtime_ns, st_size) they were read
+# at. Contents are kept marshalled so every instance unpacks its own copy and
+# in-place changes to session payloads never leak into the shared entry.
+_PARSE_CACHE: Dict[str, Tuple[int, int, bytes]] = {}
+
+
+def _remember(key: str, stat_result: os.stat_result, data: Dict[str, Any]) -> None:
+    try:
+        snapshot = marshal.dumps(data)
+    except ValueError:
+        # Payloads exported by backends may hold values marshal cannot encode.
+        _PARSE_CACHE.pop(key, None)
+        return
+
+    _PARSE_CACHE[key] = (stat_result.st_mtime_ns, stat_result.st_size, snapshot)
+
+
+def _dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(content: bytes) -> Any:
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _load_legacy_yaml(content: bytes) -> Any:
+    """Decode a cache file written as YAML by older releases.
+
+    Only these legacy files need ``yaml``, so it is imported here; libyaml's
+    loader is used when available.
+    """
+
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+    if loader is None:
+        return yaml.safe_load(content)
+    return yaml.load(content, Loader=loader)
 
 
 class SessionCache:
     """Lightweight persistent cache for backend session metadata."""
 
-    def __init__(self, path: pathlib.Path | str | None = None) -> None:
+    def __init__(self, path: pathlib.Path | str | None = None, connection_ttl: float = 0) -> None:
         self.path = pathlib.Path(path) if path else DEFAULT_CACHE_PATH
+        self.connection_ttl = connection_ttl
         self._data: Dict[str, Any] = {}
         self._loaded = False
+        self._dirty = False
 
     @classmethod
     def from_config(cls, config: Mapping[str, Any] | None) -> "SessionCache":
         cache_cfg = (config or {}).get("cache", {})
         path = cache_cfg.get("sessions_path")
-        return cls(path)
+        try:
+            connection_ttl = float(cache_cfg.get("connection_ttl", 0) or 0)
+        except (TypeError, ValueError) as exc:
+            raise click.ClickException("Config 'cache.connection_ttl' must be a number") from exc
+
+        return cls(path, connection_ttl=connection_ttl)
+
+    @staticmethod
+    def fingerprint(domain: str, backend_name: str, config: Mapping[str, Any]) -> str:
+        """Return a stable digest identifying a backend and its resolved config."""
+
+        payload = json.dumps([domain, backend_name, config], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
     def _ensure_loaded(self) -> None:
         if self._loaded:
             return
 
         self._loaded = True
-        if not self.path.exists():
+        source = self.path
+        try:
+            stat_result = source.stat()
+        except OSError:
+            if self.path != DEFAULT_CACHE_PATH:
+                return
+            source = LEGACY_CACHE_PATH
+            try:
+                stat_result = source.stat()
+            except OSError:
+                return
+            # Written to the new default path on close.
+            self._dirty = True
+
+        key = str(source)
+        cached = _PARSE_CACHE.get(key)
+        if cached is not None and cached[:2] == (stat_result.st_mtime_ns, stat_result.st_size):
+            self._data = marshal.loads(cached[2])
+        else:
+            try:
+                raw = source.read_bytes()
+                try:
+                    content = _loads(raw) or {}
+                except ValueError:
+                    content = _load_legacy_yaml(raw) or {}
+                    # Rewrite as JSON on close so later runs skip the YAML parse.
+                    self._dirty = True
+                if isinstance(content, dict):
+                    self._data = content
+                    _remember(key, stat_result, content)
+            except Exception:  # pragma: no cover - defensive
+                self._data = {}
+
+        self._drop_legacy_connections()
+
+    def _drop_legacy_connections(self) -> None:
+        """Forget connection records that hold a full backend config.
+
+        Older releases stored the complete post-connect config, credentials
+        included; those records are dropped so the file is rewritten without them.
+        """
+
+        connections = self._data.get(CONNECTIONS_KEY)
+        if not isinstance(connections, dict):
             return
 
-        try:
-            content = yaml.safe_load(self.path.read_text(encoding="utf-8")) or {}
-            if isinstance(content, dict):
-                self._data = content
-        except Exception:  # pragma: no cover - defensive
-            self._data = {}
+        kept = {
+            domain: record
+            for domain, record in connections.items()
+            if not (isinstance(record, dict) and "config" in record)
+        }
+        if len(kept) != len(connections):
+            self._data[CONNECTIONS_KEY] = kept
+            self._dirty = True
 
     def get(self, domain: str, default: Any | None = None) -> Any:
         self._ensure_loaded()
         return self._data.get(domain, default)
 
     def set(self, domain: str, payload: Any) -> None:
+        """Store ``payload`` for ``domain``; unchanged payloads are not rewritten."""
+
         self._ensure_loaded()
+        if domain in self._data and self._data[domain] == payload:
+            return
+
         self._data[domain] = payload
+        self._dirty = True
+
+    def get_connection(self, domain: str, backend_name: str, fingerprint: str) -> Dict[str, Any] | None:
+        """Return the config changes ``connect`` made on a still-fresh connection.
+
+        Connection reuse is disabled unless ``connection_ttl`` is positive.
+        Malformed records are treated as a miss.
+        """
+
+        if self.connection_ttl <= 0:
+            return None
+
+        connections = self.get(CONNECTIONS_KEY)
+        record = connections.get(domain) if isinstance(connections, dict) else None
+        if not isinstance(record, dict):
+            return None
+
+        if record.get("backend") != backend_name or record.get("fingerprint") != fingerprint:
+            return None
+
+        try:
+            connected_at = float(record["connected_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if time.time() - connected_at > self.connection_ttl:
+            return None
+
+        updates = record.get("config_updates")
+        return dict(updates) if isinstance(updates, dict) else None
+
+    def set_connection(
+        self, domain: str, backend_name: str, fingerprint: str, config_updates: Mapping[str, Any]
+    ) -> None:
+        """Record a connection; only the config keys ``connect`` changed are kept.
+
+        The configured settings themselves, which may include credentials, are
+        represented by ``fingerprint`` alone.
+        """
+
+        if self.connection_ttl <= 0:
+            return
+
+        self._ensure_loaded()
+        connections = self._data.get(CONNECTIONS_KEY)
+        connections = dict(connections) if isinstance(connections, dict) else {}
+        connections[domain] = {
+            "backend": backend_name,
+            "fingerprint": fingerprint,
+            "connected_at": time.time(),
+            "config_updates": dict(config_updates),
+        }
+        self._data[CONNECTIONS_KEY] = connections
+        self._dirty = True
 
     def persist(self) -> None:
+        """Write the cache as JSON atomically, readable only by the owner."""
+
+        encoded = _dumps(self._data)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", encoding="utf-8") as cache_file:
-            cache_file.write(yaml.safe_dump(self._data))
+        # mkstemp creates the file with mode 0600, which os.replace keeps.
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".sessions-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(encoded)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        self._dirty = False
+
+        _remember(str(self.path), self.path.stat(), self._data)
+
+    def flush_if_dirty(self) -> None:
+        """Persist pending changes; failures are logged rather than raised."""
+
+        if not self._dirty:
+            return
+
+        try:
+            self.persist()
+        except OSError as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to persist session cache to %s: %s", self.path, exc)
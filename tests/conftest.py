@@ -1,6 +1,20 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    monkeypatch.setenv("BUILDHELPER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
+@pytest.fixture(autouse=True)
+def isolated_session_cache(tmp_path_factory, monkeypatch):
+    sessions_dir = tmp_path_factory.mktemp("sessions")
+    monkeypatch.setattr("session_cache.DEFAULT_CACHE_PATH", sessions_dir / "sessions.json")
+    monkeypatch.setattr("session_cache.LEGACY_CACHE_PATH", sessions_dir / "sessions.yaml")
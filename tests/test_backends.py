@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 import click
 import pytest
 
@@ -8,15 +10,22 @@ from backends import (
     SCMBackend,
     get_backend,
     register_backend,
+    register_backend_lazy,
 )
 from backends import registry as backend_registry
 
 
 @pytest.fixture(autouse=True)
 def reset_registry(monkeypatch):
-    registry = {"scm": {}, "analysis": {}, "review": {}}
-    monkeypatch.setattr(backend_registry, "BACKEND_REGISTRY", registry)
-    monkeypatch.setattr("backends.BACKEND_REGISTRY", registry)
+    registry = {}
+    view = MappingProxyType(registry)
+    monkeypatch.setattr(backend_registry, "_REGISTRY", registry)
+    monkeypatch.setattr(backend_registry, "BACKEND_REGISTRY", view)
+    monkeypatch.setattr("backends.BACKEND_REGISTRY", view)
+    monkeypatch.setattr(backend_registry, "_SORTED_NAMES", {})
+    backend_registry._lookup_backend_cls.cache_clear()
+    yield
+    backend_registry._lookup_backend_cls.cache_clear()
 
 
 class DummySCM(SCMBackend):
@@ -74,11 +83,100 @@ def test_get_backend_defaults_to_base_config_when_no_env():
     assert backend.env is None
 
 
+def test_backend_config_lookup_is_memoized_per_config_object():
+    backend_registry.clear_config_cache()
+    config = {"backend_configs": {"dummy": {"level": "info"}}}
+
+    first = backend_registry._lookup_config(config, "dummy")
+    first["level"] = "mutated"
+    second = backend_registry._lookup_config(config, "dummy")
+
+    assert second == {"level": "info"}
+    assert backend_registry._lookup_config({"backend_configs": {"dummy": {}}}, "dummy") == {}
+
+    config["backend_configs"]["dummy"]["level"] = "debug"
+    backend_registry.clear_config_cache()
+    assert backend_registry._lookup_config(config, "dummy") == {"level": "debug"}
+
+
 def test_get_backend_raises_for_unknown_backend():
     with pytest.raises(click.ClickException):
         get_backend("review", "unknown", config={}, env="local")
 
 
+def test_get_backend_reports_known_names_and_unknown_domains():
+    register_backend("review", "dummy", DummyReview)
+
+    with pytest.raises(click.ClickException, match="Known backends: dummy"):
+        get_backend("review", "missing")
+
+    with pytest.raises(click.ClickException, match="Unknown backend domain 'deploy'"):
+        get_backend("deploy", "dummy")
+
+
+def test_registry_view_is_read_only():
+    register_backend("scm", "dummy", DummySCM)
+
+    assert backend_registry.BACKEND_REGISTRY[("scm", "dummy")] is DummySCM
+    with pytest.raises(TypeError):
+        backend_registry.BACKEND_REGISTRY[("scm", "other")] = DummySCM
+
+
+def test_register_backend_rejects_non_backend_classes():
+    with pytest.raises(TypeError):
+        register_backend("scm", "bogus", object)
+
+
+def test_lazy_backend_is_imported_on_first_lookup():
+    register_backend_lazy("scm", "lazy-git", "backends.demo.git:GitBackend")
+    assert backend_registry.BACKEND_REGISTRY[("scm", "lazy-git")] == "backends.demo.git:GitBackend"
+
+    backend = get_backend("scm", "lazy-git", config={})
+
+    from backends.demo.git import GitBackend
+
+    assert isinstance(backend, GitBackend)
+    assert backend_registry.BACKEND_REGISTRY[("scm", "lazy-git")] is GitBackend
+
+
+def test_lazy_backend_with_bad_path_raises():
+    register_backend_lazy("scm", "broken", "backends.demo.missing:Nope")
+
+    with pytest.raises(click.ClickException):
+        get_backend("scm", "broken", config={})
+
+
+def test_require_connection_connects_once_then_binds_plain_method():
+    from backends.base import require_connection
+
+    class CountingSCM(DummySCM):
+        connect_calls = 0
+
+        def connect(self):
+            CountingSCM.connect_calls += 1
+            super().connect()
+
+        @require_connection
+        def sync(self):
+            return "synced"
+
+    backend = CountingSCM(name="counting")
+
+    assert backend.sync() == "synced"
+    assert backend.sync() == "synced"
+    assert CountingSCM.connect_calls == 1
+    assert "sync" in vars(backend)
+
+
+def test_builtin_backends_do_not_carry_instance_dicts():
+    from backends.demo import GitBackend
+
+    backend = GitBackend(name="git")
+
+    assert not hasattr(backend, "__dict__")
+    assert backend.sync() == "git pull https://example.com/demo.git main"
+
+
 def test_backend_methods_are_callable():
     register_backend("review", "dummy", DummyReview)
     backend = get_backend("review", "dummy", config={"backend_configs": {"dummy": {}}})
@@ -86,3 +184,22 @@ def test_backend_methods_are_callable():
     assert backend.create_review(subject="demo") == {"review": True, "args": (), "kwargs": {"subject": "demo"}}
     assert backend.comment(body="note") == {"commented": True, "args": (), "kwargs": {"body": "note"}}
     assert backend.approve(message="ship") == {"approved": True, "args": (), "kwargs": {"message": "ship"}}
+
+
+def test_session_hook_flags_follow_subclass_methods():
+    class Restoring(SCMBackend):
+        def restore_session(self, payload):
+            pass
+
+    class Exporting(Restoring):
+        supports_session_restore = False
+
+        def export_session(self):
+            return {}
+
+    assert SCMBackend.supports_session_restore is False
+    assert SCMBackend.supports_session_export is False
+    assert Restoring.supports_session_restore is True
+    assert Restoring.supports_session_export is False
+    assert Exporting.supports_session_restore is False
+    assert Exporting.supports_session_export is True
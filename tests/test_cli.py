@@ -1,27 +1,224 @@
+import contextlib
+import copy
+import io
+import json
+import shlex
+from types import MappingProxyType
+from typing import NamedTuple
+
 import click
-from click.testing import CliRunner
 import pytest
 import yaml
 
 from backends import AnalysisBackend, ReviewBackend, SCMBackend, register_backend
 from backends import registry as backend_registry
-from cli import cli, load_config
+from cli import cli, initialize_state, load_config, parse_config
+from command_groups import workflow as workflow_module
+from command_groups.steps import split_step, tokenize_workflows
+import config_cache
+from context_state import ContextState
 from runners import LocalRunner
 
+# libyaml's emitter when PyYAML provides it; the bundled JSON shim only has safe_dump.
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", None) or getattr(yaml, "SafeDumper", None)
+
+
+def dump_yaml(data):
+    if _YAML_DUMPER is None:
+        return yaml.safe_dump(data)
+    return yaml.dump(data, Dumper=_YAML_DUMPER)
+
+
+def write_yaml(path, data):
+    path.write_bytes(dump_yaml(data).encode("utf-8"))
+
+
+# Shapes several tests write, serialized once per module.
+_KEY_VALUE_YAML = dump_yaml({"key": "value"})
+
+
+class CliResult(NamedTuple):
+    exit_code: int
+    output: str
+
 
-@pytest.fixture(autouse=True)
+def run_cli(args):
+    """Invoke ``cli`` in-process, capturing stdout and stderr together."""
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            return_value = cli.main(list(args), prog_name="cli", standalone_mode=False)
+            exit_code = return_value if isinstance(return_value, int) else 0
+        except click.ClickException as exc:
+            exc.show()
+            exit_code = exc.exit_code
+        except SystemExit as exc:
+            exit_code = exc.code if isinstance(exc.code, int) else 1
+
+    return CliResult(exit_code, buffer.getvalue())
+
+
+@pytest.fixture
 def reset_registry(monkeypatch):
-    registry = {"scm": {}, "analysis": {}, "review": {}}
-    monkeypatch.setattr(backend_registry, "BACKEND_REGISTRY", registry)
-    monkeypatch.setattr("backends.BACKEND_REGISTRY", registry)
+    """Swap in an empty backend registry for tests that register backends."""
+
+    registry = {}
+    view = MappingProxyType(registry)
+    monkeypatch.setattr(backend_registry, "_REGISTRY", registry)
+    monkeypatch.setattr(backend_registry, "BACKEND_REGISTRY", view)
+    monkeypatch.setattr("backends.BACKEND_REGISTRY", view)
+    monkeypatch.setattr(backend_registry, "_SORTED_NAMES", {})
+    backend_registry._lookup_backend_cls.cache_clear()
+    yield
+    backend_registry._lookup_backend_cls.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def cli_workdir(tmp_path_factory):
+    """Working directory shared by the tests that never write a config file."""
+
+    return tmp_path_factory.mktemp("cli")
+
+
+@pytest.fixture
+def use_config(cli_workdir, monkeypatch):
+    """Serve a config mapping to the root callback without writing config.yaml.
+
+    An empty config is installed up front; call the returned function to swap
+    in another mapping. Each load returns a fresh, tokenized copy, as
+    ``cli.load_config`` would. Tests that exercise config files themselves
+    write them instead.
+    """
+
+    monkeypatch.chdir(cli_workdir)
+
+    def install(config):
+        def load(config_path):
+            data = copy.deepcopy(config)
+            tokenize_workflows(data)
+            return data
+
+        monkeypatch.setattr("cli.load_config", load)
+        return config
+
+    install({})
+    return install
+
+
+_STUB_BASES = {"scm": SCMBackend, "analysis": AnalysisBackend, "review": ReviewBackend}
+
+
+def make_stub(domain, **methods):
+    """Build a backend class for ``domain`` from keyword methods.
+
+    Callable values become methods as-is; any other value is what the method
+    returns, whatever it is called with.
+    """
+
+    namespace = {"__slots__": ()}
+    for name, value in methods.items():
+        if not callable(value):
+            value = (lambda result: lambda self, *args, **kwargs: result)(value)
+        namespace[name] = value
+    return type(f"Stub{domain.title()}", (_STUB_BASES[domain],), namespace)
+
+
+DummySCM = make_stub(
+    "scm",
+    sync="synced",
+    status="clean",
+    submit=lambda self, message="": f"submitted:{message}",
+)
+DummyAnalysis = make_stub("analysis", scan="scanned", report=lambda self, format="text": f"report:{format}")
+DummyReview = make_stub(
+    "review",
+    create_review=lambda self, *args, **kwargs: {"review": kwargs},
+    comment=lambda self, *args, **kwargs: {"comment": kwargs},
+    approve=lambda self, *args, **kwargs: f"approved:{kwargs.get('message', '')}",
+)
+SilentSCM = make_stub("scm", sync=None, status=None, submit=None)
+SilentAnalysis = make_stub("analysis", scan=None, report=None)
+SilentReview = make_stub("review", create_review=None, comment=None, approve=None)
+
+
+@pytest.fixture
+def dummy_backends(reset_registry):
+    """Register the module's dummy backends as ``dummy`` in every domain."""
+
+    backends = {"scm": DummySCM, "analysis": DummyAnalysis, "review": DummyReview}
+    for domain, backend_cls in backends.items():
+        register_backend(domain, "dummy", backend_cls)
+    return backends
+
+
+class FakeRunner:
+    """Runner handed out by the ``fake_runner`` fixture; records what it runs."""
+
+    def __init__(self):
+        self.selections = []
+        self.calls = []
+
+    def run_command(self, cmd):
+        self.calls.append(cmd)
+        return "ok"
 
 
 @pytest.fixture
-def restore_commands():
-    original_commands = dict(cli.commands)
+def fake_runner(monkeypatch):
+    """Make ``runners.get_runner`` record its arguments and return one FakeRunner."""
+
+    runner = FakeRunner()
+
+    def get_runner(env, config):
+        runner.selections.append((env, config))
+        return runner
+
+    monkeypatch.setattr("runners.get_runner", get_runner)
+    return runner
+
+
+@click.group("_test_support")
+def _test_support():
+    """Commands the workflow tests run as steps."""
+
+
+@_test_support.command("remember")
+@click.pass_context
+def _remember(ctx):
+    ctx.obj["workflow_state"]["greeting"] = "hello"
+
+
+@_test_support.command("recall")
+@click.pass_context
+def _recall(ctx):
+    click.echo(ctx.obj["workflow_state"].get("greeting"))
+
+
+@_test_support.command("say")
+@click.argument("words", nargs=-1)
+def _say(words):
+    click.echo(" ".join(words))
+
+
+@_test_support.command("fail")
+def _fail():
+    raise click.ClickException("boom")
+
+
+@_test_support.command("run-shell")
+@click.pass_context
+def _run_shell(ctx):
+    click.echo(ctx.obj["runner"].run_command(["echo", "hello"]))
+
+
+@pytest.fixture(scope="module")
+def support_commands():
+    """Attach ``_test_support`` to ``cli`` for the tests of this module."""
+
+    cli.add_command(_test_support)
     yield
-    cli.commands.clear()
-    cli.commands.update(original_commands)
+    cli.commands.pop(_test_support.name, None)
 
 
 def test_load_config_missing_returns_empty(tmp_path):
@@ -29,158 +226,213 @@ def test_load_config_missing_returns_empty(tmp_path):
     assert load_config(str(missing_config)) == {}
 
 
+def test_load_config_empty_file_returns_empty(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.touch()
+
+    def fail_parse(stream, **kwargs):
+        raise AssertionError("empty configs should not be parsed")
+
+    monkeypatch.setattr("cli._read_config", fail_parse)
+
+    assert load_config(str(config_path)) == {}
+
+
 def test_load_config_reads_mapping(tmp_path):
     config_data = {"key": "value", "nested": {"inner": 1}}
     config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config_data), encoding="utf-8")
+    write_yaml(config_path, config_data)
 
     assert load_config(str(config_path)) == config_data
 
 
-def test_load_config_rejects_non_mapping(tmp_path):
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump([1, 2, 3]), encoding="utf-8")
+def test_load_config_reads_json_without_yaml(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"workflows": {"demo": ["scm sync"]}}))
 
-    with pytest.raises(click.ClickException):
-        load_config(str(config_path))
+    def fail_parse(stream):
+        raise AssertionError("YAML parser should not run for .json configs")
 
+    monkeypatch.setattr("cli._load_yaml", fail_parse)
 
-def test_load_config_rejects_invalid_sections(tmp_path):
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"backends": [], "envs": [], "backend_configs": []}),
-        encoding="utf-8",
-    )
+    assert load_config(str(config_path)) == {"workflows": {"demo": [["scm", "sync"]]}}
 
-    with pytest.raises(click.ClickException):
-        load_config(str(config_path))
 
+def test_parse_config_reads_streams():
+    assert parse_config(io.StringIO(_KEY_VALUE_YAML)) == {"key": "value"}
 
-def test_cli_initializes_context(tmp_path, monkeypatch):
-    config_data = {"feature": True}
-    monkeypatch.chdir(tmp_path)
+
+def test_load_config_reuses_cached_parse_until_file_changes(tmp_path, monkeypatch):
     config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config_data), encoding="utf-8")
+    config_path.write_text(_KEY_VALUE_YAML)
+    assert load_config(str(config_path)) == {"key": "value"}
 
-    with cli.make_context("cli", ["--verbose"]) as ctx:
-        cli.invoke(ctx)
-        assert ctx.obj["config"] == config_data
-        assert ctx.obj["env"] == "local"
-        assert ctx.obj["sessions"] == {}
-        assert isinstance(ctx.obj["runner"], LocalRunner)
-        assert ctx.obj["workflow_state"] == {}
-        assert ctx.obj["verbose"] is True
-        assert ctx.obj["quiet"] is False
+    def fail_parse(stream):
+        raise AssertionError("config should have been served from cache")
 
+    with monkeypatch.context() as patch:
+        patch.setattr("cli._load_yaml", fail_parse)
+        assert load_config(str(config_path)) == {"key": "value"}
 
-def test_cli_group_invocation(tmp_path, monkeypatch):
-    monkeypatch.chdir(tmp_path)
+    write_yaml(config_path, {"key": "changed!"})
+    assert load_config(str(config_path)) == {"key": "changed!"}
+
+
+def test_load_config_tokenizes_cached_workflows_with_current_splitter(tmp_path, monkeypatch):
     config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump({}), encoding="utf-8")
+    write_yaml(config_path, {"workflows": {"demo": ["scm sync"]}})
+    assert load_config(str(config_path))["workflows"]["demo"] == [["scm", "sync"]]
 
-    runner = CliRunner()
-    result = runner.invoke(cli, [])
+    monkeypatch.setattr("command_groups.steps.split_step", lambda step: step.upper().split())
 
-    assert result.exit_code == 0
+    assert load_config(str(config_path))["workflows"]["demo"] == [["SCM", "SYNC"]]
 
 
-def test_cli_respects_quiet_flag(tmp_path, monkeypatch):
-    monkeypatch.chdir(tmp_path)
+def test_load_config_reuses_in_process_cache_without_cache_file(tmp_path, monkeypatch):
     config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump({}), encoding="utf-8")
+    config_path.write_text(_KEY_VALUE_YAML)
+    assert load_config(str(config_path)) == {"key": "value"}
 
-    with cli.make_context("cli", ["--quiet"]) as ctx:
-        cli.invoke(ctx)
-        assert ctx.obj["verbose"] is False
-        assert ctx.obj["quiet"] is True
+    for cache_file in config_cache.cache_dir().iterdir():
+        cache_file.unlink()
 
+    def fail_parse(stream):
+        raise AssertionError("config should have been served from memory")
 
-def test_cli_rejects_verbose_and_quiet_together(tmp_path, monkeypatch):
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump({}), encoding="utf-8")
+    with monkeypatch.context() as patch:
+        patch.setattr("cli._load_yaml", fail_parse)
+        first = load_config(str(config_path))
+        first["key"] = "mutated"
+        assert load_config(str(config_path)) == {"key": "value"}
+
+    config_cache.clear_memory()
+    assert load_config(str(config_path)) == {"key": "value"}
+
+
+def test_parse_config_pretokenizes_string_workflow_steps():
+    stream = io.StringIO(
+        dump_yaml({"workflows": {"demo": ["scm sync", "review create --subject 'Two words'", ["analysis", "scan"]]}})
+    )
+
+    assert parse_config(stream)["workflows"]["demo"] == [
+        ["scm", "sync"],
+        ["review", "create", "--subject", "Two words"],
+        ["analysis", "scan"],
+    ]
+
+
+@pytest.mark.parametrize("step", ["review create --subject caf\xa0e", " scm\tsync\r\n", "x\x0cy"])
+def test_split_step_matches_shlex_whitespace(step):
+    assert split_step(step) == shlex.split(step)
+
+
+def test_parse_config_rejects_non_mapping():
+    with pytest.raises(click.ClickException):
+        parse_config(io.StringIO("[1, 2, 3]\n"))
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["--verbose", "--quiet", "scm", "status"])
 
+def test_invalid_sections_are_rejected_where_used(dummy_backends, use_config):
+    use_config({"envs": []})
+    result = run_cli([])
     assert result.exit_code != 0
-    assert "mutually exclusive" in result.output
+    assert "Config 'envs' section must be a mapping" in result.output
 
+    use_config({"backends": {"scm": "dummy"}, "backend_configs": []})
+    result = run_cli(["scm", "status"])
+    assert result.exit_code != 0
+    assert "Config 'backend_configs' section must be a mapping" in result.output
 
-def test_cli_selects_runner_for_environment(monkeypatch, tmp_path):
-    config_data = {"envs": {"staging": {"runner": {"type": "local", "custom": True}}}}
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config_data), encoding="utf-8")
 
-    created_runners = []
+def test_initialize_state_populates_context(tmp_path, use_config):
+    config_data = {"feature": True}
+    use_config(config_data)
 
-    def fake_get_runner(env, config):
-        runner = object()
-        created_runners.append((env, config, runner))
-        return runner
+    state = initialize_state(ContextState(), config_path=tmp_path / "config.yaml", verbose=True)
 
-    monkeypatch.setattr("cli.get_runner", fake_get_runner)
+    assert state["config"] == config_data
+    assert state["env"] == "local"
+    assert state["sessions"] == {}
+    assert isinstance(state["runner"], LocalRunner)
+    assert state["workflow_state"] == {}
+    assert state["verbose"] is True
+    assert state["quiet"] is False
+    assert state["initialized"] is True
 
-    runner = CliRunner()
-    result = runner.invoke(cli, [])
 
-    assert result.exit_code == 0
-    assert created_runners == [("local", config_data, created_runners[0][2])]
+def test_cli_creates_session_cache_and_telemetry_on_first_use(tmp_path, use_config):
+    cache_path = tmp_path / "sessions.yaml"
+    use_config({"cache": {"sessions_path": str(cache_path)}})
 
+    with cli.make_context("cli", []) as ctx:
+        cli.invoke(ctx)
+        state = ctx.obj
+        assert state._session_cache is None
+        assert state._telemetry is None
 
-def test_ensure_session_connects_and_stores_backend(tmp_path, monkeypatch):
-    class DummySCM(SCMBackend):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-            self.connected = False
+        assert state.session_cache.path == cache_path
+        assert state.session_cache is state.session_cache
+        assert state.telemetry is state.telemetry
 
-        def connect(self):
-            self.connected = True
 
-        def sync(self):
-            return "synced"
+def test_cli_import_defers_heavy_modules():
+    import subprocess
+    import sys
+    from pathlib import Path
 
-        def status(self):
-            return {"connected": self.connected}
+    probe = (
+        "import sys, cli; "
+        "print(sorted(m for m in ('backends', 'command_groups.scm', 'command_groups.workflow', 'runners', 'session_cache', 'telemetry', 'yaml') "
+        "if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=Path(__file__).resolve().parent.parent, check=True, capture_output=True, text=True
+    ).stdout
 
-        def submit(self, message: str = ""):
-            return {"submitted": True, "message": message}
+    assert output.strip() == "[]"
 
-    register_backend("scm", "dummy", DummySCM)
-    config = {"backends": {"scm": "dummy"}, "backend_configs": {"dummy": {}}}
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["scm", "status"])
+def test_cli_group_invocation(use_config):
+    result = run_cli([])
 
     assert result.exit_code == 0
-    assert "{'connected': True}" in result.output
-
 
-def test_ensure_session_raises_when_backend_missing(tmp_path, monkeypatch):
-    class DummyAnalysis(AnalysisBackend):
-        def scan(self):
-            return {"ran": True}
 
-        def report(self, format: str = "text"):
-            return {"format": format}
+def test_cli_respects_quiet_flag(use_config):
+    with cli.make_context("cli", ["--quiet"]) as ctx:
+        cli.invoke(ctx)
+        assert ctx.obj["verbose"] is False
+        assert ctx.obj["quiet"] is True
 
-    register_backend("analysis", "dummy", DummyAnalysis)
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump({"backends": {}}), encoding="utf-8")
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["analysis", "scan"])
+def test_cli_rejects_verbose_and_quiet_together(use_config):
+    result = run_cli(["--verbose", "--quiet", "scm", "status"])
 
     assert result.exit_code != 0
-    assert "No backend configured for domain" in result.output
+    assert "mutually exclusive" in result.output
+
+
+def test_cli_selects_runner_for_environment(fake_runner, use_config):
+    config_data = {"envs": {"staging": {"runner": {"type": "local", "custom": True}}}}
+    use_config(config_data)
 
+    result = run_cli([])
+
+    assert result.exit_code == 0
+    assert fake_runner.selections == [("local", config_data)]
+
+
+def test_ensure_session_connects_and_stores_backend(reset_registry, use_config):
+    register_backend("scm", "dummy", make_stub("scm", status=lambda self: {"connected": self._connected}))
+    config = {"backends": {"scm": "dummy"}, "backend_configs": {"dummy": {}}}
+    use_config(config)
 
-def test_session_cache_restores_and_persists(tmp_path, monkeypatch):
+    result = run_cli(["scm", "status"])
+
+    assert result.exit_code == 0
+    assert "{'connected': True}" in result.output
+
+
+def test_session_cache_restores_and_persists(reset_registry, tmp_path, use_config):
     cache_path = tmp_path / "cache.yaml"
 
     class DummySCM(SCMBackend):
@@ -209,19 +461,16 @@ def test_session_cache_restores_and_persists(tmp_path, monkeypatch):
         def submit(self, message: str = ""):
             return {"submitted": message}
 
-    cache_path.write_text(yaml.safe_dump({"scm": {"token": "cached"}}))
+    write_yaml(cache_path, {"scm": {"token": "cached"}})
 
     register_backend("scm", "cached", DummySCM)
     config = {
         "backends": {"scm": "cached"},
         "cache": {"sessions_path": str(cache_path)},
     }
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
+    use_config(config)
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["scm", "status"])
+    result = run_cli(["scm", "status"])
 
     assert result.exit_code == 0
     assert DummySCM.last_instance.restored_payload == {"token": "cached"}
@@ -229,32 +478,92 @@ def test_session_cache_restores_and_persists(tmp_path, monkeypatch):
     assert persisted["scm"] == {"token": "new-token"}
 
 
-def test_ensure_session_reports_missing_backends_section(tmp_path, monkeypatch):
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump({}), encoding="utf-8")
+def test_session_refreshed_in_place_is_persisted(reset_registry, tmp_path, use_config):
+    cache_path = tmp_path / "cache.yaml"
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["scm", "status"])
+    class RefreshingSCM(SCMBackend):
+        __slots__ = ("session",)
 
-    assert result.exit_code != 0
-    assert "missing required 'backends' section" in result.output
+        def restore_session(self, payload):
+            self.session = payload
 
+        def export_session(self):
+            self.session["token"] = "refreshed"
+            return self.session
 
-def test_ensure_session_rejects_non_mapping_backends(tmp_path, monkeypatch):
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump({"backends": []}), encoding="utf-8")
+        def status(self):
+            return "clean"
+
+    write_yaml(cache_path, {"scm": {"token": "old"}})
+    register_backend("scm", "refreshing", RefreshingSCM)
+    use_config({"backends": {"scm": "refreshing"}, "cache": {"sessions_path": str(cache_path)}})
+
+    result = run_cli(["scm", "status"])
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["scm", "status"])
+    assert result.exit_code == 0
+    assert yaml.safe_load(cache_path.read_text())["scm"] == {"token": "refreshed"}
+
+
+def test_cached_connection_skips_connect_on_later_invocations(reset_registry, tmp_path, use_config):
+    cache_path = tmp_path / "cache.yaml"
+    connect_calls = []
+
+    class DummySCM(SCMBackend):
+        def connect(self):
+            connect_calls.append(self.name)
+            self.config.setdefault("branch", "main")
+            super().connect()
+
+        def sync(self):  # pragma: no cover - not used
+            return "synced"
+
+        def status(self):
+            return f"branch={self.config['branch']}"
+
+        def submit(self, message: str = ""):  # pragma: no cover - not used
+            return message
+
+    register_backend("scm", "dummy", DummySCM)
+    config = {
+        "backends": {"scm": "dummy"},
+        "backend_configs": {"dummy": {"token": "s3cret"}},
+        "cache": {"sessions_path": str(cache_path), "connection_ttl": 60},
+    }
+    use_config(config)
+
+    first = run_cli(["scm", "status"])
+    second = run_cli(["scm", "status"])
+
+    assert first.exit_code == 0
+    assert second.exit_code == 0
+    assert "branch=main" in second.output
+    assert connect_calls == ["dummy"]
+    assert "s3cret" not in cache_path.read_text()
+
+
+@pytest.mark.parametrize(
+    ("config", "expected"),
+    [
+        ({}, "missing required 'backends' section"),
+        ({"backends": []}, "Config 'backends' section must be a mapping"),
+        ({"backends": {}}, "No backend configured for domain 'analysis'"),
+    ],
+    ids=["missing-section", "non-mapping", "domain-not-configured"],
+)
+def test_ensure_session_rejects_bad_backends_config(dummy_backends, use_config, config, expected):
+    use_config(config)
+
+    result = run_cli(["analysis", "scan"])
 
     assert result.exit_code != 0
-    assert "must be a mapping" in result.output
+    assert expected in result.output
 
 
-def test_ensure_session_calls_backend_connect_and_command(monkeypatch, tmp_path):
+def test_ensure_session_calls_backend_connect_and_command(monkeypatch, use_config):
     class StubBackend:
+        supports_session_restore = False
+        supports_session_export = False
+
         def __init__(self):
             self.connect_calls = 0
             self.status_calls = 0
@@ -276,12 +585,9 @@ def test_ensure_session_calls_backend_connect_and_command(monkeypatch, tmp_path)
     monkeypatch.setattr("command_groups.common.get_backend", fake_get_backend)
 
     config = {"backends": {"scm": "stub"}, "backend_configs": {"stub": {}}}
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
+    use_config(config)
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["scm", "status"])
+    result = run_cli(["scm", "status"])
 
     assert result.exit_code == 0
     assert "stub-status" in result.output
@@ -290,25 +596,9 @@ def test_ensure_session_calls_backend_connect_and_command(monkeypatch, tmp_path)
     assert backend_instances[0][4].status_calls == 1
 
 
-def test_telemetry_records_command_duration(tmp_path, monkeypatch):
-    class DummySCM(SCMBackend):
-        def connect(self):
-            return None
-
-        def sync(self):
-            return "synced"
-
-        def status(self):  # pragma: no cover - not used
-            return "status"
-
-        def submit(self, message: str = ""):
-            return {"message": message}
-
-    register_backend("scm", "dummy", DummySCM)
+def test_telemetry_records_command_duration(dummy_backends, use_config):
     config = {"backends": {"scm": "dummy"}}
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
+    use_config(config)
 
     with cli.make_context("cli", ["scm", "sync"]) as ctx:
         cli.invoke(ctx)
@@ -316,7 +606,7 @@ def test_telemetry_records_command_duration(tmp_path, monkeypatch):
         assert any(event.name == "scm.sync" for event in events)
 
 
-def test_ensure_session_wraps_connection_errors(tmp_path, monkeypatch):
+def test_ensure_session_wraps_connection_errors(reset_registry, use_config):
     class FailingSCM(SCMBackend):
         def connect(self):
             raise RuntimeError("unreachable host")
@@ -331,126 +621,69 @@ def test_ensure_session_wraps_connection_errors(tmp_path, monkeypatch):
             return message
 
     register_backend("scm", "failing", FailingSCM)
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"backends": {"scm": "failing"}, "backend_configs": {"failing": {}}}),
-        encoding="utf-8",
-    )
+    use_config({"backends": {"scm": "failing"}, "backend_configs": {"failing": {}}})
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["scm", "status"])
+    result = run_cli(["scm", "status"])
 
     assert result.exit_code != 0
     assert "Failed to connect to backend 'failing'" in result.output
 
 
-def test_command_outputs_include_backend_results(tmp_path, monkeypatch):
-    class DummySCM(SCMBackend):
-        def sync(self):
-            return "synced"
-
-        def status(self):
-            return "clean"
-
-        def submit(self, message: str = ""):
-            return f"submitted:{message}"
-
-    class DummyAnalysis(AnalysisBackend):
-        def scan(self):
-            return "scanned"
-
-        def report(self, format: str = "text"):
-            return f"report:{format}"
-
-    class DummyReview(ReviewBackend):
-        def create_review(self, *args, **kwargs):
-            return {"review": kwargs}
-
-        def comment(self, *args, **kwargs):
-            return {"comment": kwargs}
-
-        def approve(self, *args, **kwargs):
-            return f"approved:{kwargs.get('message', '')}"
-
-    register_backend("scm", "dummy", DummySCM)
-    register_backend("analysis", "dummy", DummyAnalysis)
-    register_backend("review", "dummy", DummyReview)
-
-    config = {
-        "backends": {"scm": "dummy", "analysis": "dummy", "review": "dummy"},
-        "backend_configs": {"dummy": {}},
-    }
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
-
-    runner = CliRunner()
-
-    submit_result = runner.invoke(cli, ["scm", "submit", "--message", "ready"])
-    assert submit_result.exit_code == 0
-    assert "submitted:ready" in submit_result.output
-
-    report_result = runner.invoke(cli, ["analysis", "report", "--format", "json"])
-    assert report_result.exit_code == 0
-    assert "report:json" in report_result.output
-
-    approve_result = runner.invoke(cli, ["review", "approve", "--message", "ship"])
-    assert approve_result.exit_code == 0
-    assert "approved:ship" in approve_result.output
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        (["scm", "submit", "--message", "ready"], "submitted:ready"),
+        (["analysis", "report", "--format", "json"], "report:json"),
+        (["review", "approve", "--message", "ship"], "approved:ship"),
+    ],
+)
+def test_command_outputs_include_backend_results(dummy_backends, use_config, args, expected):
+    use_config(
+        {
+            "backends": {"scm": "dummy", "analysis": "dummy", "review": "dummy"},
+            "backend_configs": {"dummy": {}},
+        }
+    )
 
+    result = run_cli(args)
 
-def test_commands_print_invocation_messages_even_without_backend_output(tmp_path, monkeypatch):
-    class SilentSCM(SCMBackend):
-        def sync(self):
-            return None
-
-        def status(self):
-            return None
+    assert result.exit_code == 0
+    assert expected in result.output
 
-        def submit(self, message: str = ""):
-            return None
 
+def test_commands_print_invocation_messages_even_without_backend_output(reset_registry, use_config):
     register_backend("scm", "silent", SilentSCM)
 
     config = {"backends": {"scm": "silent"}, "backend_configs": {"silent": {}}}
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
-
-    runner = CliRunner()
+    use_config(config)
 
-    sync_result = runner.invoke(cli, ["scm", "sync"])
+    sync_result = run_cli(["scm", "sync"])
     assert sync_result.exit_code == 0
     assert "[scm] Executing sync" in sync_result.output
 
-    status_result = runner.invoke(cli, ["scm", "status"])
+    status_result = run_cli(["scm", "status"])
     assert status_result.exit_code == 0
     assert "[scm] Checking status" in status_result.output
 
-    submit_result = runner.invoke(cli, ["scm", "submit", "--message", "msg"])
+    submit_result = run_cli(["scm", "submit", "--message", "msg"])
     assert submit_result.exit_code == 0
     assert "[scm] Submitting with message: msg" in submit_result.output
 
 
-def test_analysis_and_review_commands_emit_invocation_messages(tmp_path, monkeypatch):
-    class SilentAnalysis(AnalysisBackend):
-        def scan(self):
-            return None
+def test_quiet_flag_suppresses_invocation_banners(reset_registry, use_config):
+    register_backend("scm", "echo", DummySCM)
 
-        def report(self, format: str = "text"):
-            return None
+    config = {"backends": {"scm": "echo"}, "backend_configs": {"echo": {}}}
+    use_config(config)
 
-    class SilentReview(ReviewBackend):
-        def create_review(self, *args, **kwargs):
-            return None
+    result = run_cli(["--quiet", "scm", "sync"])
 
-        def comment(self, *args, **kwargs):
-            return None
+    assert result.exit_code == 0
+    assert "[scm]" not in result.output
+    assert "synced" in result.output
 
-        def approve(self, *args, **kwargs):
-            return None
 
+def test_analysis_and_review_commands_emit_invocation_messages(reset_registry, use_config):
     register_backend("analysis", "silent-analysis", SilentAnalysis)
     register_backend("review", "silent-review", SilentReview)
 
@@ -458,168 +691,207 @@ def test_analysis_and_review_commands_emit_invocation_messages(tmp_path, monkeyp
         "backends": {"analysis": "silent-analysis", "review": "silent-review"},
         "backend_configs": {"silent-analysis": {}, "silent-review": {}},
     }
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
-
-    runner = CliRunner()
+    use_config(config)
 
-    scan_result = runner.invoke(cli, ["analysis", "scan"])
+    scan_result = run_cli(["analysis", "scan"])
     assert scan_result.exit_code == 0
     assert "[analysis] Running scan" in scan_result.output
 
-    report_result = runner.invoke(cli, ["analysis", "report", "--format", "json"])
+    report_result = run_cli(["analysis", "report", "--format", "json"])
     assert report_result.exit_code == 0
     assert "[analysis] Generating report in json format" in report_result.output
 
-    create_result = runner.invoke(cli, ["review", "create", "--subject", "demo"])
+    create_result = run_cli(["review", "create", "--subject", "demo"])
     assert create_result.exit_code == 0
     assert "[review] Creating review with subject: demo" in create_result.output
 
-    comment_result = runner.invoke(cli, ["review", "comment"])
+    comment_result = run_cli(["review", "comment"])
     assert comment_result.exit_code == 0
     assert "[review] Adding comment" in comment_result.output
 
-    approve_result = runner.invoke(cli, ["review", "approve"])
+    approve_result = run_cli(["review", "approve"])
     assert approve_result.exit_code == 0
     assert "[review] Approving change" in approve_result.output
 
 
-def test_workflow_run_executes_steps(tmp_path, restore_commands, monkeypatch):
-    @click.command("remember")
-    @click.pass_context
-    def remember(ctx):
-        ctx.obj["workflow_state"]["greeting"] = "hello"
+def test_workflow_run_executes_steps(support_commands, use_config):
+    use_config({"workflows": {"demo": ["_test_support remember", "_test_support recall"]}})
+
+    result = run_cli(["workflow", "run", "demo"])
+
+    assert result.exit_code == 0
+    assert "hello" in result.output
 
-    @click.command("recall")
-    @click.pass_context
-    def recall(ctx):
-        click.echo(ctx.obj["workflow_state"].get("greeting"))
 
-    cli.add_command(remember)
-    cli.add_command(recall)
+def test_workflow_run_stops_on_error(support_commands, use_config):
+    use_config({"workflows": {"demo": ["_test_support fail", "_test_support say after"]}})
 
+    result = run_cli(["workflow", "run", "demo"])
+
+    assert result.exit_code != 0
+    assert "after" not in result.output
+    assert "Step '_test_support fail' failed" in result.output
+
+
+def test_workflow_run_continues_when_requested(support_commands, use_config):
+    use_config({"workflows": {"demo": ["_test_support fail", "_test_support say after"]}})
+
+    result = run_cli(["workflow", "run", "demo", "--continue-on-error"])
+
+    assert result.exit_code != 0
+    assert "after" in result.output
+    assert "completed with 1 failed step(s)" in result.output
+
+
+def test_workflow_steps_dispatch_to_subcommands_without_reloading_config(tmp_path, monkeypatch, dummy_backends):
+    config = {
+        "backends": {"scm": "dummy"},
+        "workflows": {"demo": ["scm status", ["scm", "submit", "--message", "done"]]},
+    }
     monkeypatch.chdir(tmp_path)
     config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"workflows": {"demo": [["remember"], ["recall"]]}}),
-        encoding="utf-8",
-    )
+    write_yaml(config_path, config)
+
+    load_calls = []
+    original_load_config = load_config
+
+    def counting_load_config(path):
+        load_calls.append(path)
+        return original_load_config(path)
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["workflow", "run", "demo"])
+    monkeypatch.setattr("cli.load_config", counting_load_config)
+
+    result = run_cli(["workflow", "run", "demo"])
 
     assert result.exit_code == 0
-    assert "hello" in result.output
+    assert "clean" in result.output
+    assert "submitted:done" in result.output
+    assert len(load_calls) == 1
 
 
-def test_workflow_run_stops_on_error(tmp_path, restore_commands, monkeypatch):
-    @click.command("fail")
-    def fail():
-        raise click.ClickException("boom")
+def test_workflow_run_reports_unknown_step_command(use_config):
+    use_config({"workflows": {"demo": [["scm", "missing"]]}})
 
-    @click.command("after")
-    def after():
-        click.echo("after")
+    result = run_cli(["workflow", "run", "demo"])
 
-    cli.add_command(fail)
-    cli.add_command(after)
+    assert result.exit_code != 0
+    assert "No such command 'missing'" in result.output
 
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"workflows": {"demo": [["fail"], ["after"]]}}),
-        encoding="utf-8",
-    )
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["workflow", "run", "demo"])
+def test_workflow_run_rejects_mapping_steps(use_config):
+    use_config({"workflows": {"demo": [{"scm": "status"}]}})
+
+    result = run_cli(["workflow", "run", "demo"])
 
     assert result.exit_code != 0
-    assert "after" not in result.output
-    assert "Step 'fail' failed" in result.output
+    assert "Workflow steps must be strings or lists of arguments" in result.output
 
 
-def test_workflow_run_continues_when_requested(tmp_path, restore_commands, monkeypatch):
-    @click.command("fail")
-    def fail():
-        raise click.ClickException("boom")
+def test_workflow_run_resolves_every_step_before_running(support_commands, monkeypatch, use_config):
+    original_resolve = workflow_module._resolve_step
 
-    @click.command("after")
-    def after():
-        click.echo("after")
+    def recording_resolve(ctx, root_command, step_args):
+        click.echo(f"resolve:{step_args[-1]}")
+        return original_resolve(ctx, root_command, step_args)
 
-    cli.add_command(fail)
-    cli.add_command(after)
+    monkeypatch.setattr(workflow_module, "_resolve_step", recording_resolve)
+    use_config({"workflows": {"demo": ["_test_support say first", "_test_support say second"]}})
 
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"workflows": {"demo": [["fail"], ["after"]]}}),
-        encoding="utf-8",
-    )
+    result = run_cli(["workflow", "run", "demo"])
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["workflow", "run", "demo", "--continue-on-error"])
+    assert result.exit_code == 0
+    lines = [line for line in result.output.splitlines() if not line.startswith("[workflow]")]
+    assert lines == ["resolve:first", "resolve:second", "first", "second"]
 
-    assert result.exit_code != 0
-    assert "after" in result.output
-    assert "completed with 1 failed step(s)" in result.output
 
+def test_workflow_steps_run_group_callbacks_with_direct_command_paths(monkeypatch, use_config):
+    @click.group("deploy")
+    def deploy():
+        click.echo("deploy callback")
 
-def test_workflow_command_announces_execution(tmp_path, restore_commands, monkeypatch):
-    @click.command("noop")
-    def noop():
-        click.echo("noop")
+    @deploy.command("plan")
+    @click.pass_context
+    def plan(ctx):
+        click.echo(ctx.command_path)
 
-    cli.add_command(noop)
+    monkeypatch.setitem(cli.commands, "deploy", deploy)
+    use_config({"workflows": {"demo": ["deploy plan"]}})
 
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"workflows": {"demo": [["noop"], ["noop"]]}}),
-        encoding="utf-8",
-    )
+    result = run_cli(["workflow", "run", "demo"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines()[-2:] == ["deploy callback", "cli deploy plan"]
+
+
+def test_workflow_run_resolves_repeated_steps_once(support_commands, monkeypatch, use_config):
+    resolutions = []
+    original_resolve = workflow_module._resolve_step
+
+    def recording_resolve(ctx, root_command, step_args):
+        resolutions.append(list(step_args))
+        return original_resolve(ctx, root_command, step_args)
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["workflow", "run", "demo"])
+    monkeypatch.setattr(workflow_module, "_resolve_step", recording_resolve)
+    use_config({"workflows": {"demo": ["_test_support say a", "_test_support say a", "_test_support say b"]}})
+
+    result = run_cli(["workflow", "run", "demo"])
+
+    assert result.exit_code == 0
+    assert result.output.splitlines()[-3:] == ["a", "a", "b"]
+    assert resolutions == [["_test_support", "say", "a"], ["_test_support", "say", "b"]]
+
+
+def test_workflow_command_announces_execution(support_commands, use_config):
+    use_config({"workflows": {"demo": ["_test_support say noop", "_test_support say noop"]}})
+
+    result = run_cli(["workflow", "run", "demo"])
 
     assert result.exit_code == 0
     assert "[workflow] Running 'demo' with 2 step(s)" in result.output
 
 
-def test_workflow_steps_share_runner(monkeypatch, tmp_path, restore_commands):
-    class StubRunner:
-        def __init__(self):
-            self.calls = []
+def test_workflow_steps_share_runner(fake_runner, support_commands, use_config):
+    use_config({"workflows": {"demo": ["_test_support run-shell", "_test_support run-shell"]}})
 
-        def run_command(self, cmd):
-            self.calls.append(cmd)
-            return "ok"
+    result = run_cli(["workflow", "run", "demo"])
 
-    stub_runner = StubRunner()
+    assert result.exit_code == 0
+    assert len(fake_runner.selections) == 1
+    assert fake_runner.calls == [["echo", "hello"], ["echo", "hello"]]
 
-    def fake_get_runner(env, config):
-        return stub_runner
 
-    monkeypatch.setattr("cli.get_runner", fake_get_runner)
+def test_workflow_steps_share_backend_sessions(reset_registry, monkeypatch, use_config):
+    connects = []
 
-    @click.command("run-shell")
-    @click.pass_context
-    def run_shell(ctx):
-        click.echo(ctx.obj["runner"].run_command(["echo", "hello"]))
+    class CountingSCM(SCMBackend):
+        def connect(self):
+            connects.append(self.name)
+            super().connect()
 
-    cli.add_command(run_shell)
+        def status(self):
+            return "clean"
 
-    monkeypatch.chdir(tmp_path)
-    config_path = tmp_path / "config.yaml"
-    config_path.write_text(
-        yaml.safe_dump({"workflows": {"demo": [["run-shell"], ["run-shell"]]}}),
-        encoding="utf-8",
+        def sync(self):
+            return "synced"
+
+    register_backend("scm", "counting", CountingSCM)
+    lookups = []
+    original_get_backend = backend_registry.get_backend
+
+    def counting_get_backend(*args, **kwargs):
+        lookups.append(args)
+        return original_get_backend(*args, **kwargs)
+
+    monkeypatch.setattr("command_groups.common.get_backend", counting_get_backend)
+    use_config(
+        {
+            "backends": {"scm": "counting"},
+            "workflows": {"demo": ["scm status", "scm sync", "scm status"]},
+        }
     )
 
-    runner = CliRunner()
-    result = runner.invoke(cli, ["workflow", "run", "demo"])
+    result = run_cli(["workflow", "run", "demo"])
 
     assert result.exit_code == 0
-    assert stub_runner.calls == [["echo", "hello"], ["echo", "hello"]]
+    assert connects == ["counting"]
+    assert len(lookups) == 1
@@ -0,0 +1,43 @@
+import pytest
+
+from context_state import ContextState
+from session_cache import SessionCache
+from telemetry import TelemetryCollector
+
+
+def test_mapping_view_exposes_fixed_keys():
+    state = ContextState()
+
+    assert len(state) == 10
+    assert list(state)[:3] == ["config", "env", "sessions"]
+    assert state["sessions"] == {}
+    assert state.get("missing") is None
+    assert "ensure" not in state
+
+
+def test_unknown_keys_raise_key_error():
+    state = ContextState()
+
+    with pytest.raises(KeyError):
+        state["missing"] = 1
+
+    with pytest.raises(KeyError):
+        del state["missing"]
+
+
+def test_to_dict_matches_mapping_view():
+    state = ContextState(env="local")
+
+    assert state.to_dict() == dict(state.items())
+    assert list(state.to_dict()) == list(state)
+
+
+def test_constructor_accepts_session_cache_and_telemetry(tmp_path):
+    cache = SessionCache(tmp_path / "sessions.json")
+    collector = TelemetryCollector()
+
+    state = ContextState(session_cache=cache, telemetry=collector)
+
+    assert state.session_cache is cache
+    assert state.telemetry is collector
+    assert state["session_cache"] is cache
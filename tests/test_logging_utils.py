@@ -0,0 +1,29 @@
+import logging
+
+import logging_utils
+
+
+def test_configure_logging_reapplies_level_changed_elsewhere(monkeypatch):
+    root_logger = logging.getLogger()
+    monkeypatch.setattr(root_logger, "level", root_logger.level)
+    monkeypatch.setattr(root_logger, "handlers", [logging.NullHandler()])
+
+    logging_utils.configure_logging(verbose=True)
+    assert root_logger.level == logging.DEBUG
+
+    root_logger.setLevel(logging.WARNING)
+    logging_utils.configure_logging(verbose=True)
+    assert root_logger.level == logging.DEBUG
+
+    logging_utils.configure_logging(quiet=True)
+    assert root_logger.level == logging.ERROR
+
+
+def test_configure_logging_installs_handler_when_removed(monkeypatch):
+    root_logger = logging.getLogger()
+    monkeypatch.setattr(root_logger, "level", logging.INFO)
+    monkeypatch.setattr(root_logger, "handlers", [])
+
+    logging_utils.configure_logging()
+
+    assert root_logger.handlers
@@ -0,0 +1,39 @@
+from importlib import metadata
+
+import plugins
+
+
+class FakeEntryPoint:
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+
+    def load(self):
+        return self._loader
+
+
+class FakeEntryPoints(list):
+    def select(self, group):
+        return [entry for entry in self if group == "buildhelper.test"]
+
+
+def test_discover_plugins_scans_each_group_once(monkeypatch):
+    loaded = []
+    scans = []
+
+    def loader():
+        loaded.append("demo")
+        plugins.discover_plugins("buildhelper.test")
+
+    def fake_entry_points():
+        scans.append(True)
+        return FakeEntryPoints([FakeEntryPoint("demo", loader)])
+
+    monkeypatch.setattr(plugins, "_DISCOVERED", set())
+    monkeypatch.setattr(metadata, "entry_points", fake_entry_points)
+
+    plugins.discover_plugins("buildhelper.test")
+    plugins.discover_plugins("buildhelper.test")
+
+    assert loaded == ["demo"]
+    assert len(scans) == 1
@@ -3,6 +3,7 @@ import subprocess
 import click
 import pytest
 
+import runners
 from runners import DockerRunner, K8sRunner, LocalRunner, get_runner
 
 
@@ -36,7 +37,7 @@ def test_docker_runner_builds_exec_command(monkeypatch):
 
     assert result == "docker"
     assert calls == [
-        (["docker", "exec", "builder", "ls", "/app"], {"check": True, "text": True}),
+        (("docker", "exec", "builder", "ls", "/app"), {"check": True, "text": True}),
     ]
 
 
@@ -54,7 +55,7 @@ def test_k8s_runner_honors_namespace(monkeypatch):
 
     assert result == "k8s"
     assert calls == [
-        (["kubectl", "-n", "demo", "exec", "api", "--", "whoami"], {"check": True, "text": True}),
+        (("kubectl", "-n", "demo", "exec", "api", "--", "whoami"), {"check": True, "text": True}),
     ]
 
 
@@ -70,3 +71,43 @@ def test_get_runner_unknown_env_raises():
     with pytest.raises(click.ClickException):
         get_runner("unknown", config)
 
+
+def test_string_commands_are_split_once(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kwargs: cmd)
+    runner = LocalRunner("local")
+
+    first = runner.run_command("git status --short")
+    second = runner.run_command("git status --short")
+
+    assert first == ("git", "status", "--short")
+    assert second is first
+
+
+def test_k8s_runner_without_namespace(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kwargs: cmd)
+
+    runner = K8sRunner("k8s", pod="api")
+
+    assert runner.run_command(["id", "-u"]) == ("kubectl", "exec", "api", "--", "id", "-u")
+
+
+def test_register_runner_adds_runner_type(monkeypatch):
+    created = []
+
+    def make_stub(env, env_config):
+        created.append((env, dict(env_config)))
+        return LocalRunner(env)
+
+    monkeypatch.setitem(runners._RUNNER_FACTORIES, "stub", make_stub)
+    runners.register_runner("stub", make_stub)
+
+    config = {"envs": {"ci": {"runner": {"type": "stub", "flag": True}}}}
+    assert isinstance(get_runner("ci", config), LocalRunner)
+    assert created == [("ci", {"type": "stub", "flag": True})]
+
+
+def test_tuple_commands_are_passed_through(monkeypatch):
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kwargs: cmd)
+    command = ("echo", "hello")
+
+    assert LocalRunner("local").run_command(command) is command
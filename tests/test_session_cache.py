@@ -0,0 +1,142 @@
+import json
+import stat
+import time
+
+import click
+import pytest
+import yaml
+
+import session_cache
+from session_cache import CONNECTIONS_KEY, SessionCache
+
+
+def test_set_defers_write_until_flush(tmp_path):
+    cache_path = tmp_path / "sessions.yaml"
+    cache = SessionCache(cache_path)
+
+    cache.set("scm", {"token": "abc"})
+    assert not cache_path.exists()
+
+    cache.flush_if_dirty()
+    assert yaml.safe_load(cache_path.read_text()) == {"scm": {"token": "abc"}}
+
+    cache_path.unlink()
+    cache.flush_if_dirty()
+    assert not cache_path.exists()
+
+
+def test_reads_legacy_yaml_cache_files(tmp_path):
+    cache_path = tmp_path / "sessions.yaml"
+    cache_path.write_text(yaml.safe_dump({"scm": {"token": "abc"}}), encoding="utf-8")
+
+    cache = SessionCache(cache_path)
+
+    assert cache.get("scm") == {"token": "abc"}
+
+
+def test_new_instances_reuse_parse_until_file_changes(tmp_path, monkeypatch):
+    cache_path = tmp_path / "sessions.yaml"
+    writer = SessionCache(cache_path)
+    writer.set("scm", {"token": "abc"})
+    writer.persist()
+
+    def fail_loads(content):
+        raise AssertionError("cache file should not be parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("session_cache._loads", fail_loads)
+        assert SessionCache(cache_path).get("scm") == {"token": "abc"}
+
+    cache_path.write_text(yaml.safe_dump({"scm": {"token": "rotated"}}), encoding="utf-8")
+    assert SessionCache(cache_path).get("scm") == {"token": "rotated"}
+
+
+def test_in_place_payload_changes_do_not_leak_into_new_instances(tmp_path):
+    cache_path = tmp_path / "sessions.yaml"
+    writer = SessionCache(cache_path)
+    writer.set("scm", {"token": "abc"})
+    writer.persist()
+
+    writer.get("scm")["token"] = "mutated"
+    reader = SessionCache(cache_path)
+    reader.get("scm")["token"] = "also mutated"
+
+    assert SessionCache(cache_path).get("scm") == {"token": "abc"}
+
+
+def test_legacy_yaml_cache_is_rewritten_as_json(tmp_path):
+    if not hasattr(yaml, "SafeLoader"):
+        pytest.skip("bundled yaml shim only reads JSON-compatible content")
+
+    cache_path = tmp_path / "sessions.yaml"
+    cache_path.write_text("scm:\n  token: abc\n", encoding="utf-8")
+
+    cache = SessionCache(cache_path)
+    assert cache.get("scm") == {"token": "abc"}
+    cache.flush_if_dirty()
+
+    assert json.loads(cache_path.read_text(encoding="utf-8")) == {"scm": {"token": "abc"}}
+
+
+def test_setting_an_unchanged_payload_does_not_rewrite(tmp_path):
+    cache_path = tmp_path / "sessions.yaml"
+    writer = SessionCache(cache_path)
+    writer.set("scm", {"token": "abc"})
+    writer.persist()
+
+    cache = SessionCache(cache_path)
+    cache.set("scm", {"token": "abc"})
+    cache_path.unlink()
+    cache.flush_if_dirty()
+    assert not cache_path.exists()
+
+    cache.set("scm", {"token": "rotated"})
+    cache.flush_if_dirty()
+    assert cache_path.exists()
+
+
+@pytest.mark.parametrize("ttl", ["soon", [60]])
+def test_from_config_rejects_non_numeric_connection_ttl(ttl):
+    with pytest.raises(click.ClickException, match="cache.connection_ttl"):
+        SessionCache.from_config({"cache": {"connection_ttl": ttl}})
+
+
+@pytest.mark.parametrize("connected_at", ["soon", [1], None])
+def test_malformed_connection_record_is_a_miss(tmp_path, connected_at):
+    cache_path = tmp_path / "sessions.json"
+    record = {"backend": "git", "fingerprint": "abc", "connected_at": connected_at, "config_updates": {}}
+    cache_path.write_text(json.dumps({CONNECTIONS_KEY: {"scm": record}}), encoding="utf-8")
+
+    assert SessionCache(cache_path, connection_ttl=60).get_connection("scm", "git", "abc") is None
+
+
+def test_connections_persist_only_config_updates_owner_readable(tmp_path):
+    cache_path = tmp_path / "sessions.json"
+    cache = SessionCache(cache_path, connection_ttl=60)
+    cache.set_connection("scm", "git", "abc", {"branch": "main"})
+    cache.persist()
+
+    record = json.loads(cache_path.read_text(encoding="utf-8"))[CONNECTIONS_KEY]["scm"]
+    assert record["config_updates"] == {"branch": "main"}
+    assert "config" not in record
+    assert stat.S_IMODE(cache_path.stat().st_mode) == 0o600
+    assert SessionCache(cache_path, connection_ttl=60).get_connection("scm", "git", "abc") == {"branch": "main"}
+
+
+def test_default_cache_migrates_legacy_yaml_path_without_full_configs():
+    legacy = {
+        "scm": {"token": "abc"},
+        CONNECTIONS_KEY: {
+            "scm": {"backend": "git", "fingerprint": "abc", "connected_at": time.time(), "config": {"token": "secret"}}
+        },
+    }
+    session_cache.LEGACY_CACHE_PATH.write_text(json.dumps(legacy), encoding="utf-8")
+
+    cache = SessionCache()
+    assert cache.get("scm") == {"token": "abc"}
+    cache.flush_if_dirty()
+
+    assert json.loads(session_cache.DEFAULT_CACHE_PATH.read_text(encoding="utf-8")) == {
+        "scm": {"token": "abc"},
+        CONNECTIONS_KEY: {},
+    }
@@ -0,0 +1,39 @@
+import pytest
+
+from telemetry import TelemetryCollector, TelemetryEvent
+
+
+def test_collector_boxes_buffered_records_in_order():
+    collector = TelemetryCollector()
+
+    with collector.track("first"):
+        pass
+
+    with pytest.raises(RuntimeError):
+        with collector.track("second"):
+            raise RuntimeError("boom")
+
+    collector.record_event("third", status="success", duration_ms=1.5)
+
+    events = collector.events
+    assert all(isinstance(event, TelemetryEvent) for event in events)
+    assert [(event.name, event.status, event.error) for event in events] == [
+        ("first", "success", None),
+        ("second", "error", "boom"),
+        ("third", "success", None),
+    ]
+    assert collector.events is events
+
+
+def test_events_only_carry_metadata_when_given():
+    collector = TelemetryCollector()
+
+    with collector.track("plain"):
+        pass
+    with collector.track("tagged", metadata={"step": 1}):
+        pass
+
+    plain, tagged = collector.events
+    assert plain.metadata is None
+    assert tagged.metadata == {"step": 1}
+    assert not hasattr(plain, "__dict__")
@@ -1,8 +1,9 @@
 """Minimal YAML support for environments without external dependencies.
 
 This module provides a small subset of PyYAML's public API, limited to
-`safe_load` and `safe_dump`, backed by JSON parsing/serialization. It supports
-YAML content that is compatible with JSON syntax, which is sufficient for the
+`safe_load` and `safe_dump`, backed by JSON parsing/serialization (``orjson``
+when it is installed, the standard library otherwise). It supports YAML
+content that is compatible with JSON syntax, which is sufficient for the
 project's configuration needs in offline environments.
 """
 
@@ -11,19 +12,23 @@ from __future__ import annotations
 import json
 from typing import Any, IO
 
+try:  # pragma: no cover - optional speedup
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 
 class YAMLError(Exception):
     """Raised when YAML content cannot be parsed."""
 
 
-def _read_stream(stream: str | bytes | IO[str] | IO[bytes]) -> str:
-    if hasattr(stream, "read"):
-        return stream.read()  # type: ignore[no-any-return]
-
-    if isinstance(stream, bytes):
-        return stream.decode()
+def _read_stream(stream: str | bytes | IO[str] | IO[bytes]) -> str | bytes:
+    # Both JSON parsers accept bytes, so byte content is passed through undecoded.
+    read = getattr(stream, "read", None)
+    if read is not None:
+        return read()  # type: ignore[no-any-return]
 
-    return str(stream)
+    return stream  # type: ignore[return-value]
 
 
 def safe_load(stream: str | bytes | IO[str] | IO[bytes]) -> Any:
@@ -34,12 +39,15 @@ def safe_load(stream: str | bytes | IO[str] | IO[bytes]) -> Any:
         return None
 
     try:
-        return json.loads(content)
-    except json.JSONDecodeError as exc:  # pragma: no cover - precise message unimportant
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+    except ValueError as exc:  # pragma: no cover - precise message unimportant
         raise YAMLError("Unable to parse YAML content as JSON-compatible text") from exc
 
 
 def safe_dump(data: Any, **_: Any) -> str:
-    """Serialize data to YAML (JSON-compatible) string."""
+    """Serialize data to a compact YAML (JSON-compatible) string."""
+
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
-    return json.dumps(data, indent=2)
+    return json.dumps(data, separators=(",", ":"))